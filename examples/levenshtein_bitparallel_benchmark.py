@@ -0,0 +1,20 @@
+import time
+
+from spellwise import Levenshtein
+
+query_words = ["internationalisation", "misunderstandingly", "counterrevolutionarys"]
+
+for engine in ["dp", "bitparallel"]:
+    suggester = Levenshtein(engine=engine)
+    suggester.add_from_path("examples/data/american-english")
+
+    start_time = time.perf_counter()
+    for query_word in query_words:
+        suggestions = suggester.get_suggestions(query_word, max_distance=3)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(
+        "{} \t {:.1f} milliseconds per query".format(
+            engine, 1000 * elapsed_time / len(query_words)
+        )
+    )
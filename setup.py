@@ -14,6 +14,7 @@ setuptools.setup(
     url="https://github.com/chinnichaitanya/spellwise",
     packages=setuptools.find_packages(),
     install_requires=["typing;python_version<'3.5'"],
+    extras_require={"numpy": ["numpy"]},
     classifiers=[
         "Intended Audience :: Developers",
         "Intended Audience :: Science/Research",
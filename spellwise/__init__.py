@@ -1,6 +1,14 @@
 # flake8: noqa
 
-__all__ = ["CaverphoneOne", "CaverphoneTwo", "Editex", "Levenshtein", "Soundex" "Typox"]
+__all__ = [
+    "CaverphoneOne",
+    "CaverphoneTwo",
+    "Editex",
+    "Levenshtein",
+    "Soundex",
+    "SymSpell",
+    "Typox",
+]
 
 from .algorithms import (
     CaverphoneOne,
@@ -8,5 +16,6 @@ from .algorithms import (
     Editex,
     Levenshtein,
     Soundex,
+    SymSpell,
     Typox,
 )
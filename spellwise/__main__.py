@@ -0,0 +1,273 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple
+
+from .algorithms import ALGORITHMS
+from .algorithms.base import Base
+from .utils import get_percentile, iter_tokens, open_text
+
+
+class _LatencySample(object):
+    """A uniform random sample of a bounded number of latencies (reservoir sampling),
+    so that the percentiles of a job of any size are estimated in constant memory
+    """
+
+    def __init__(self, size: int = 100000) -> None:
+        """The constructor for the class
+
+        Args:
+            size (int, optional): The maximum number of latencies kept. Defaults to 100000
+        """
+
+        self.size = size
+        self.count = 0
+        self.maximum = 0.0
+        self._values = list()
+        self._random = random.Random(0)
+
+    def add(self, latency: float) -> None:
+        """Add a latency to the sample
+
+        Args:
+            latency (float): The latency (seconds)
+        """
+
+        self.count += 1
+        if latency > self.maximum:
+            self.maximum = latency
+        if len(self._values) < self.size:
+            self._values.append(latency)
+        else:
+            index = self._random.randrange(self.count)
+            if index < self.size:
+                self._values[index] = latency
+
+    def percentile(self, percentile: float) -> float:
+        """The estimated percentile of the latencies
+
+        Args:
+            percentile (float): The percentile, between 0 and 100
+
+        Returns:
+            float: The latency at the percentile (seconds)
+        """
+
+        return get_percentile(sorted(self._values), percentile)
+
+
+def _iter_queries(
+    algorithm: Base, lines: Iterator[str], text: bool
+) -> Iterator[Tuple[Optional[str], dict]]:
+    """Lazily get the query words of the inputs, with the fields of their output records.
+    The words which the algorithm cannot pre-process, such as the words without any
+    letter for the phonetic algorithms, are not searched and get an error instead
+
+    Args:
+        algorithm (Base): The algorithm
+        lines (Iterator[str]): The lines of the inputs
+        text (bool): Whether the inputs are running text, whose indexed words are skipped, instead of one query word per line
+
+    Yields:
+        Tuple[Optional[str], dict]: The query word, None if it cannot be searched, and the fields of its record, before the suggestions or with the `error`
+    """
+
+    if text:
+        words = (
+            (word, {"word": word, "start": start, "end": start + len(word)})
+            for word, start in iter_tokens(lines)
+        )
+    else:
+        words = (
+            (word, {"word": word}) for word in (line.strip() for line in lines) if word
+        )
+
+    for word, record in words:
+        try:
+            query_word = algorithm._get_misspelt_query(word) if text else word
+            if query_word is None:
+                continue
+            algorithm._pre_process(query_word)
+        except Exception as error:
+            record["error"] = "{}: {}".format(type(error).__name__, error)
+            yield None, record
+            continue
+        yield query_word, record
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Write the suggestions of a stream of words or text as JSON lines, with the
+    throughput and latency statistics of the job on stderr
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m spellwise",
+        description="Suggest corrections for a stream of words or text, one JSON line per query word",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        default=["-"],
+        help="files to correct, optionally gzip, bz2 or xz compressed, - for stdin (default: stdin)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        default="Levenshtein",
+        choices=sorted(ALGORITHMS),
+        help="algorithm to use (default: %(default)s)",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--lexicon",
+        help="word list to index, one word (and optionally a tab and its frequency) per line",
+    )
+    source.add_argument("--index", help="index file written by the algorithm's save()")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="index the words in the array based CompactDictionary",
+    )
+    parser.add_argument(
+        "--engine",
+        help="engine of the Trie search, e.g. numpy, or bitparallel for Levenshtein",
+    )
+    parser.add_argument(
+        "--text",
+        action="store_true",
+        help="the inputs are running text: only the words which are not indexed are written, with their offsets",
+    )
+    parser.add_argument(
+        "--output", "-o", help="file to write the JSON lines to (default: stdout)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of forked worker processes, 1 to search in this process (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="number of query words sent to a worker at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=float,
+        help="maximum distance of the suggestions (default: the algorithm's)",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="maximum number of suggestions per query word"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not print the statistics of the job to stderr",
+    )
+    arguments = parser.parse_args(args)
+
+    if arguments.workers <= 0:
+        parser.error("--workers must be positive")
+    if arguments.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    options = dict()
+    if arguments.compact:
+        options["compact"] = True
+    if arguments.engine:
+        if arguments.engine not in ALGORITHMS[arguments.algorithm].ENGINES:
+            parser.error(
+                "unknown engine '{}' for {}".format(
+                    arguments.engine, arguments.algorithm
+                )
+            )
+        options["engine"] = arguments.engine
+
+    start_time = time.perf_counter()
+    algorithm = ALGORITHMS[arguments.algorithm](**options)
+    if arguments.lexicon:
+        algorithm.add_from_path(arguments.lexicon)
+    else:
+        algorithm.load(arguments.index)
+    if arguments.text:
+        algorithm.build_filter()
+    load_time = time.perf_counter() - start_time
+
+    max_distance = arguments.max_distance
+    if max_distance is not None and max_distance.is_integer():
+        max_distance = int(max_distance)
+
+    with ExitStack() as stack:
+        streams = [
+            sys.stdin if path == "-" else stack.enter_context(open_text(path))
+            for path in arguments.inputs
+        ]
+        output = sys.stdout
+        if arguments.output:
+            output = stack.enter_context(open(arguments.output, "w"))
+
+        # The records of the query words read and not written yet, with the time they
+        # were read, as the workers search ahead. The records of the errors are written
+        # in their turn
+        pending = deque()
+        errors = 0
+
+        def iter_query_words() -> Iterator[str]:
+            for query_word, record in _iter_queries(
+                algorithm, chain.from_iterable(streams), arguments.text
+            ):
+                pending.append((record, time.perf_counter()))
+                if query_word is not None:
+                    yield query_word
+
+        def write_errors() -> int:
+            count = 0
+            while pending and "error" in pending[0][0]:
+                output.write(json.dumps(pending.popleft()[0]) + "\n")
+                count += 1
+            return count
+
+        latencies = _LatencySample()
+        start_time = time.perf_counter()
+        for suggestions in algorithm.get_suggestions_batch(
+            iter_query_words(),
+            max_distance,
+            arguments.limit,
+            workers=arguments.workers,
+            chunk_size=arguments.chunk_size,
+        ):
+            errors += write_errors()
+            record, read_time = pending.popleft()
+            record["suggestions"] = suggestions
+            output.write(json.dumps(record) + "\n")
+            latencies.add(time.perf_counter() - read_time)
+        errors += write_errors()
+        output.flush()
+        elapsed = time.perf_counter() - start_time
+
+    if not arguments.quiet:
+        sys.stderr.write(
+            "algorithm={algorithm} load={load:.2f}s queries={queries} errors={errors} "
+            "elapsed={elapsed:.2f}s throughput={throughput:.1f}/s "
+            "p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms max={max:.3f}ms\n".format(
+                algorithm=arguments.algorithm,
+                load=load_time,
+                queries=latencies.count,
+                errors=errors,
+                elapsed=elapsed,
+                throughput=latencies.count / elapsed if elapsed > 0 else 0.0,
+                p50=latencies.percentile(50) * 1000,
+                p95=latencies.percentile(95) * 1000,
+                p99=latencies.percentile(99) * 1000,
+                max=latencies.maximum * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 # flake8: noqa
 
 __all__ = [
+    "ALGORITHMS",
     "CaverphoneOne",
     "CaverphoneTwo",
     "Editex",
     "Levenshtein",
     "Soundex",
+    "SymSpell",
     "Typox",
 ]
 
@@ -14,4 +16,16 @@ from .caverphone_two import CaverphoneTwo
 from .editex import Editex
 from .levenshtein import Levenshtein
 from .soundex import Soundex
+from .symspell import SymSpell
 from .typox import Typox
+
+# The algorithms by name, as chosen on the command lines
+ALGORITHMS = {
+    "Levenshtein": Levenshtein,
+    "Editex": Editex,
+    "Typox": Typox,
+    "Soundex": Soundex,
+    "CaverphoneOne": CaverphoneOne,
+    "CaverphoneTwo": CaverphoneTwo,
+    "SymSpell": SymSpell,
+}
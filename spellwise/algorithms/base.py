@@ -1,15 +1,378 @@
-from typing import List
+import gc
+import heapq
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
-from ..dictionary import Dictionary
+from ..cache import LRUCache
+from ..dictionary import CompactDictionary, Dictionary
+from ..filters import BloomFilter
+from ..stats import SearchStats
+from ..utils import get_length_bounds, iter_tokens, rank_candidates, read_words
+from .session import SuggestionSession
+from .vectorized import numpy, vectorized_search
+
+
+class CostModel(object):
+    """The costs of the edit operations used by the Trie search. This model has unit
+    costs (the Levenshtein edit-distance) and algorithms with other costs subclass it
+    """
+
+    def insert_costs(self, query_word: str) -> list:
+        """The cost to take every letter of the query word without a letter of the
+            indexed word, which only depends on the query word
+
+        Args:
+            query_word (str): The pre-processed query word
+
+        Returns:
+            list: The cost for every letter of the query word, after a leading 0
+        """
+
+        return [0] + [1] * len(query_word)
+
+    def delete_cost(self, parent_letter: Optional[str], letter: str) -> float:
+        """The cost to take a letter of the indexed word without a letter of the query word
+
+        Args:
+            parent_letter (Optional[str]): The letter before it in the indexed word, None for the first letter
+            letter (str): The letter of the indexed word
+
+        Returns:
+            float: The cost to delete the letter
+        """
+
+        return 1
+
+    def replace_costs(self, letter: str, query_word: str) -> list:
+        """The cost to match a letter of the indexed word with every letter of the query word
+
+        Args:
+            letter (str): The letter of the indexed word
+            query_word (str): The pre-processed query word
+
+        Returns:
+            list: The cost for every letter of the query word, after a leading 0
+        """
+
+        return [0] + [
+            0 if letter == target_letter else 1 for target_letter in query_word
+        ]
+
+    def min_delete_cost(self) -> float:
+        """The smallest cost to delete a letter of an indexed word
+
+        Returns:
+            float: The lower bound of `delete_cost(...)`
+        """
+
+        return 1
+
+    def max_length_difference(
+        self, insert_costs: list, max_distance: float
+    ) -> Optional[int]:
+        """The largest difference between the lengths of the query word and of a word
+            within the maximum distance of it, as every letter in excess is inserted or
+            deleted at some cost
+
+        Args:
+            insert_costs (list): The insert costs of the query word, see `insert_costs(...)`
+            max_distance (float): The maximum distance between the words indexed and the query word
+
+        Returns:
+            Optional[int]: The largest difference, or None if inserting or deleting a letter can be free
+        """
+
+        min_indel_cost = min([self.min_delete_cost()] + insert_costs[1:])
+        if min_indel_cost <= 0 or max_distance == float("inf"):
+            return None
+        return int(max_distance // min_indel_cost)
+
+
+class TableCostModel(CostModel):
+    """The costs of the edit operations given by functions of two letters, which are
+    compiled into tables over the letters known in advance
+    """
+
+    def __init__(
+        self,
+        replace: Callable[[str, str], float],
+        delete: Callable[[str, str], float],
+        first_delete_cost: float,
+        letters: Iterable[str],
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            replace (Callable[[str, str], float]): The cost to replace the first letter with the second one
+            delete (Callable[[str, str], float]): The cost to delete the second letter after the first one
+            first_delete_cost (float): The cost to delete the first letter of a word
+            letters (Iterable[str]): The letters for which the costs are compiled into tables, the costs of other letters are computed by the functions
+        """
+
+        self._replace = replace
+        self._delete = delete
+        self._first_delete_cost = first_delete_cost
+
+        letters = sorted(set(letters))
+        self._replace_costs = {a: {b: replace(a, b) for b in letters} for a in letters}
+        self._delete_costs = {a: {b: delete(a, b) for b in letters} for a in letters}
+
+    def insert_costs(self, query_word: str) -> list:
+        """The cost to take every letter of the query word without a letter of the
+            indexed word, which only depends on the query word
+
+        Args:
+            query_word (str): The pre-processed query word
+
+        Returns:
+            list: The cost for every letter of the query word, after a leading 0
+        """
+
+        if not query_word:
+            return [0]
+
+        return [0, self._first_delete_cost] + [
+            self._cost(self._delete_costs, self._delete, a, b)
+            for a, b in zip(query_word, query_word[1:])
+        ]
+
+    def delete_cost(self, parent_letter: Optional[str], letter: str) -> float:
+        """The cost to take a letter of the indexed word without a letter of the query word
+
+        Args:
+            parent_letter (Optional[str]): The letter before it in the indexed word, None for the first letter
+            letter (str): The letter of the indexed word
+
+        Returns:
+            float: The cost to delete the letter
+        """
+
+        if parent_letter is None:
+            return self._first_delete_cost
+        return self._cost(self._delete_costs, self._delete, parent_letter, letter)
+
+    def replace_costs(self, letter: str, query_word: str) -> list:
+        """The cost to match a letter of the indexed word with every letter of the query word
+
+        Args:
+            letter (str): The letter of the indexed word
+            query_word (str): The pre-processed query word
+
+        Returns:
+            list: The cost for every letter of the query word, after a leading 0
+        """
+
+        return [0] + [
+            self._cost(self._replace_costs, self._replace, letter, target_letter)
+            for target_letter in query_word
+        ]
+
+    def min_delete_cost(self) -> float:
+        """The smallest cost to delete a letter of an indexed word, over the compiled
+            tables. The letters outside them are expected to cost no less
+
+        Returns:
+            float: The lower bound of `delete_cost(...)`
+        """
+
+        return min(
+            [self._first_delete_cost]
+            + [min(costs.values()) for costs in self._delete_costs.values()]
+        )
+
+    def _cost(self, costs: dict, cost_function: Callable, a: str, b: str) -> float:
+        """Look up the cost for the letters in the compiled cost table, falling back
+            to computing it for letters outside the table
+
+        Args:
+            costs (dict): The compiled cost table
+            cost_function (Callable): The function computing the cost
+            a (str): First letter
+            b (str): Second letter
+
+        Returns:
+            float: The cost for the letters
+        """
+
+        try:
+            return costs[a][b]
+        except KeyError:
+            return cost_function(a, b)
+
+
+def _count_rows(
+    fill_row: Callable[[Optional[str], str, list, list, int], float],
+    counts: dict,
+    band: float,
+    query_length: int,
+    max_distance: float,
+) -> Callable[[Optional[str], str, list, list, int], float]:
+    """Wrap the function computing the rows of the Trie search so that it counts the
+        nodes visited, the cells computed and the subtrees pruned by the distance. The
+        search only goes through it when the statistics are recorded
+
+    Args:
+        fill_row (Callable[[Optional[str], str, list, list, int], float]): The function computing the rows
+        counts (dict): The counters of the query
+        band (float): The largest difference between the column of a cell computed and the depth of its node
+        query_length (int): The length of the pre-processed query word
+        max_distance (float): The maximum distance between the words indexed and the query word
+
+    Returns:
+        Callable[[Optional[str], str, list, list, int], float]: The counting function
+    """
+
+    def counting_fill_row(
+        parent_source_letter: Optional[str],
+        current_source_letter: str,
+        previous_row: list,
+        current_row: list,
+        depth: int,
+    ) -> float:
+        minimum = fill_row(
+            parent_source_letter,
+            current_source_letter,
+            previous_row,
+            current_row,
+            depth,
+        )
+
+        # The cells of the band, and the first cell when the band reaches it
+        start = max(depth - band, 1)
+        stop = min(depth + band, query_length)
+        counts["nodes"] += 1
+        counts["cells"] += int(max(stop - start + 1, 0)) + (depth - band <= 1)
+        if minimum > max_distance:
+            counts["pruned"] += 1
+        return minimum
+
+    return counting_fill_row
+
+
+# The algorithm searched by a batch worker process, inherited from the parent process
+_BATCH_ALGORITHM = None
+
+
+def _init_batch_worker(algorithm: "Base") -> None:
+    """Set the algorithm searched by a batch worker process
+
+    Args:
+        algorithm (Base): The algorithm
+    """
+
+    global _BATCH_ALGORITHM
+    _BATCH_ALGORITHM = algorithm
+
+
+def _search_batch(
+    algorithm: "Base",
+    processed_query_words: List[str],
+    max_distance: float,
+    limit: Optional[int],
+) -> List[Tuple[Tuple[str, float], ...]]:
+    """Get the suggestions of a chunk of pre-processed query words, as tuples which are
+        cheaper to send between processes than dicts
+
+    Args:
+        algorithm (Base): The algorithm
+        processed_query_words (List[str]): The pre-processed query words
+        max_distance (float): The maximum distance between the words indexed and the query words
+        limit (Optional[int]): The maximum number of suggestions per query word, None for all the suggestions
+
+    Returns:
+        List[Tuple[Tuple[str, float], ...]]: The word and distance of the suggestions of every query word
+    """
+
+    return [
+        tuple(
+            (item["word"], item["distance"])
+            for item in algorithm._search(processed_query_word, max_distance, limit)
+        )
+        for processed_query_word in processed_query_words
+    ]
+
+
+def _run_in_batch_worker(function: Callable[..., Any], *args: Any) -> Any:
+    """Call a function with the algorithm searched by a batch worker process, in the
+    worker processes forked by `Base._create_batch_executor(...)`
+
+    Args:
+        function (Callable[..., Any]): The function, defined at the top level of a module
+        *args (Any): The other arguments of the function
+
+    Returns:
+        Any: The result of the function
+    """
+
+    return function(_BATCH_ALGORITHM, *args)
+
+
+def _search_batch_in_worker(
+    processed_query_words: List[str], max_distance: float, limit: Optional[int]
+) -> List[Tuple[Tuple[str, float], ...]]:
+    """Get the suggestions of a chunk of query words in a worker, see `_search_batch(...)`"""
+
+    return _run_in_batch_worker(
+        _search_batch, processed_query_words, max_distance, limit
+    )
 
 
 class Base(object):
-    """The base class for all the spelling correction and word suggestion algorithms"""
+    """The base class for all the spelling correction and word suggestion algorithms.
+
+    The indexed words can be changed while other threads search them. Every change
+    builds a new version of the Trie dictionary, sharing the unchanged nodes with the
+    current one, and then swaps it in, so a search never takes a lock and always sees
+    one consistent version. Changes are serialized by a lock, and the old versions are
+    freed once the searches using them are done
+    """
+
+    ENGINES = ("dp", "numpy")
+
+    def __init__(self, compact: bool = False, engine: str = "dp") -> None:
+        """The constructor for the class
+
+        Args:
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary` instead of the object based `Dictionary`, whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used for the Trie search, one of `ENGINES`. "numpy" computes the rows of a whole depth of the Trie at once and needs NumPy, falling back to "dp" without it. Defaults to "dp"
+        """
+
+        if engine not in self.ENGINES:
+            raise ValueError(
+                "Unknown engine '{}', expected one of {}".format(engine, self.ENGINES)
+            )
+        if engine == "numpy" and numpy is None:
+            warnings.warn(
+                "NumPy is not installed, the 'dp' engine is used instead of 'numpy'",
+                RuntimeWarning,
+            )
+            engine = "dp"
+        self._engine = engine
 
-    def __init__(self) -> None:
         self._alphabet = "abcdefghijklmnopqrstuvwxyz"
         self._vowels = "aeiou"
-        self._dictionary = Dictionary()
+        if compact:
+            self._dictionary = CompactDictionary()
+        else:
+            self._dictionary = Dictionary()
+        self._cache = None
+        self._stats = None
+        self._stats_local = threading.local()
+        self._cost_model = CostModel()
+        self._write_lock = threading.RLock()
+        self._version = 0
+        self._staged = None
+        self._owner = None
+        self._filter = None
+        self._false_positive_rate = 0.01
 
     def _pre_process(self, word: str) -> str:
         """Pre-processor for every word to be indexed and queried.
@@ -24,25 +387,1122 @@ class Base(object):
 
         return word.lower()
 
-    def add_words(self, words: List[str]) -> None:
+    def _pre_process_many(self, words: List[str]) -> List[str]:
+        """Pre-process many words at once, see `_pre_process(...)`
+
+        Args:
+            words (List[str]): The words to be pre-processed
+
+        Returns:
+            List[str]: The pre-processed words
+        """
+
+        return [self._pre_process(word) for word in words]
+
+    def add_words(
+        self, words: List[str], frequencies: Optional[List[Optional[float]]] = None
+    ) -> None:
         """Helper method to add words (index) to the dictionary used by the algorithm
 
         Args:
             words (List[str]): The list of words to be indexed
+            frequencies (Optional[List[Optional[float]]], optional): The frequency of every word, used to rank the suggestions at the same distance. A frequency of None keeps the frequency of an indexed word, or is 0 for a new word. Defaults to None
         """
 
-        processed_actual_words = [(self._pre_process(word), word) for word in words]
-        self._dictionary.add_words(processed_actual_words)
+        if frequencies is None:
+            frequencies = [None] * len(words)
+        processed_actual_words = list(
+            zip(self._pre_process_many(words), words, frequencies)
+        )
+        with self._write_lock:
+            self._add_to_filter(processed_actual_words)
+            if self._staged is not None:
+                self._staged = self._staged.with_words(
+                    processed_actual_words, self._owner
+                )
+                return
+            self._dictionary = self._dictionary.with_words(processed_actual_words)
+            self._version += 1
+            self._invalidate_cache()
 
-    def add_from_path(self, path: str) -> None:
-        """Helper method to add words (index) from a file where each line consists of a word.
-            This internally calls the `add_words(...)` method for every word
+    def add_from_path(self, path: str, batch_size: int = 10000) -> None:
+        """Helper method to add words (index) from a file where each line consists of a word,
+            or of a word and its frequency separated by a tab. The file can be gzip, bz2 or
+            xz compressed. It is streamed and the words are added in batches with the
+            `add_words(...)` method, so the memory used does not depend on the file size.
+            The batches make up a single new version, which searches see once the whole
+            file is read. If the file cannot be read to the end, none of its words are
+            added and the error is raised
 
         Args:
             path (str): The path to the file
+            batch_size (int, optional): The number of words added at once. Defaults to 10000
+        """
+
+        if path is None:
+            return
+
+        with self._write_lock:
+            self._staged = self._dictionary
+            self._owner = object()
+            try:
+                batch = list()
+                frequencies = list()
+                for word, frequency in read_words(path):
+                    batch.append(word.lower().strip())
+                    frequencies.append(frequency)
+                    if len(batch) >= batch_size:
+                        self.add_words(batch, frequencies)
+                        batch = list()
+                        frequencies = list()
+                if batch:
+                    self.add_words(batch, frequencies)
+            except BaseException:
+                # The previous version stays, and the Bloom filter is rebuilt without
+                # the words read, whose bits cannot be cleared
+                self._staged = None
+                self._owner = None
+                self._filter = None
+                raise
+
+            self._dictionary = self._staged
+            self._staged = None
+            self._owner = None
+            self._version += 1
+            self._invalidate_cache()
+
+    def remove_words(self, words: List[str]) -> None:
+        """Helper method to remove indexed words from the dictionary used by the algorithm,
+            without rebuilding it. Words which are not indexed are skipped
+
+        Args:
+            words (List[str]): The list of words to be removed
+        """
+
+        processed_actual_words = list(zip(self._pre_process_many(words), words))
+        with self._write_lock:
+            self._dictionary = self._dictionary.without_words(processed_actual_words)
+            # The bits of the removed words cannot be cleared
+            self._filter = None
+            self._version += 1
+            self._invalidate_cache()
+
+    def has_word(self, word: str) -> bool:
+        """Check whether the word is indexed in the dictionary used by the algorithm
+
+        Args:
+            word (str): The word
+
+        Returns:
+            bool: Whether the word is indexed
+        """
+
+        return self._dictionary.has_word(self._pre_process(word), word)
+
+    def update_word(
+        self,
+        word: str,
+        new_word: Optional[str] = None,
+        frequency: Optional[float] = None,
+    ) -> None:
+        """Helper method to update an indexed word in place, replacing it with a new word,
+            changing its frequency, or both. When the word is replaced, the new word is
+            added before the old one is removed, so searches meanwhile find either
+
+        Args:
+            word (str): The indexed word
+            new_word (Optional[str], optional): The word replacing it. Defaults to None, which keeps the word
+            frequency (Optional[float], optional): The new frequency of the word. Defaults to None, which keeps the frequency
+
+        Raises:
+            ValueError: If the word is not indexed
+        """
+
+        with self._write_lock:
+            current_frequency = self._dictionary.get_frequency(
+                self._pre_process(word), word
+            )
+            if current_frequency is None:
+                raise ValueError("'{}' is not indexed".format(word))
+
+            if frequency is None:
+                frequency = current_frequency
+            if new_word is None or new_word == word:
+                self.add_words([word], [frequency])
+            else:
+                self.add_words([new_word], [frequency])
+                self.remove_words([word])
+
+    def is_known(self, word: str) -> bool:
+        """Check in constant time whether a word with the same pre-processed form as the
+            given one is indexed, using a Bloom filter over the pre-processed words.
+            False is always right, while True is wrong with a probability of about the
+            false positive rate of the filter, see `build_filter(...)`
+
+        Args:
+            word (str): The word
+
+        Returns:
+            bool: Whether the word is probably indexed
+        """
+
+        bloom_filter = self._filter
+        if bloom_filter is None:
+            bloom_filter = self.build_filter(self._false_positive_rate)
+        return self._pre_process(word) in bloom_filter
+
+    def build_filter(self, false_positive_rate: float = 0.01) -> BloomFilter:
+        """(Re)build the Bloom filter used by `is_known(...)`. It is built on the first
+            call to `is_known(...)` otherwise, updated when words are added and rebuilt
+            with the same false positive rate when it gets full or words are removed
+
+        Args:
+            false_positive_rate (float, optional): The probability for `is_known(...)` to find a word which is not indexed. Defaults to 0.01
+
+        Returns:
+            BloomFilter: The filter
+        """
+
+        with self._write_lock:
+            keys = list()
+            for processed_word, _, _ in self._dictionary.iter_words():
+                if not keys or keys[-1] != processed_word:
+                    keys.append(processed_word)
+
+            # Room for the words added later, before the filter is rebuilt
+            bloom_filter = BloomFilter(
+                max(1024, len(keys) + len(keys) // 4), false_positive_rate
+            )
+            for processed_word in keys:
+                bloom_filter.add(processed_word)
+            if self._staged is not None:
+                for processed_word, _, _ in self._staged.iter_words():
+                    if processed_word not in bloom_filter:
+                        bloom_filter.add(processed_word)
+
+            self._filter = bloom_filter
+            self._false_positive_rate = false_positive_rate
+            return bloom_filter
+
+    def _add_to_filter(self, words: List[Tuple[str, str, Optional[float]]]) -> None:
+        """Add the pre-processed words to the Bloom filter, if it is built, dropping it
+            once it is full
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The pre-processed words, actual words and frequencies
+        """
+
+        bloom_filter = self._filter
+        if bloom_filter is None:
+            return
+
+        for processed_word, _, _ in words:
+            if processed_word not in bloom_filter:
+                bloom_filter.add(processed_word)
+        if len(bloom_filter) > bloom_filter.capacity:
+            self._filter = None
+
+    def check_text(
+        self,
+        text: str,
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+        window: int = 1000,
+    ) -> Iterator[dict]:
+        """Spell-check a text, see `check_stream(...)`
+
+        Args:
+            text (str): The text
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the misspelt words. Defaults to None, the default of `get_suggestions(...)`
+            limit (Optional[int], optional): The maximum number of suggestions per misspelt word. Defaults to None, which returns all the suggestions
+            window (int, optional): The number of most recent distinct words whose result is reused. Defaults to 1000
+
+        Yields:
+            dict: The misspelt word, the character offsets of its `start` and `end` in the text, and its `suggestions`
+        """
+
+        return self.check_stream([text], max_distance, limit, window)
+
+    def check_stream(
+        self,
+        chunks: Iterable[str],
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+        window: int = 1000,
+    ) -> Iterator[dict]:
+        """Spell-check a stream of text, such as the lines of a file, lazily. The words
+            which are indexed (ignoring the case) are skipped without any search, only
+            the others are searched for suggestions. The words which are not indexed are
+            mostly told apart by `is_known(...)`. The results of the most recent
+            distinct words are reused for their repetitions. Typographic apostrophes are
+            looked up as plain ones
+
+        Args:
+            chunks (Iterable[str]): The text, in chunks of any size
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the misspelt words. Defaults to None, the default of `get_suggestions(...)`
+            limit (Optional[int], optional): The maximum number of suggestions per misspelt word. Defaults to None, which returns all the suggestions
+            window (int, optional): The number of most recent distinct words whose result is reused. Defaults to 1000
+
+        Yields:
+            dict: The misspelt word, the character offsets of its `start` and `end` in the stream, and its `suggestions`
         """
 
-        if path is not None:
-            path_file = open(path, "r").read().split()
-            for word in path_file:
-                self.add_words([word.lower().strip()])
+        # The suggestions of a word, or an empty tuple when it is indexed
+        results = LRUCache(window)
+        for word, start in iter_tokens(chunks):
+            suggestions = results.get(word)
+            if suggestions is None:
+                query_word = self._get_misspelt_query(word)
+                if query_word is None:
+                    suggestions = ()
+                elif max_distance is None:
+                    suggestions = self.get_suggestions(query_word, limit=limit)
+                else:
+                    suggestions = self.get_suggestions(query_word, max_distance, limit)
+                results.put(word, suggestions, results.generation)
+
+            if suggestions != ():
+                yield {
+                    "word": word,
+                    "start": start,
+                    "end": start + len(word),
+                    "suggestions": [dict(suggestion) for suggestion in suggestions],
+                }
+
+    def begin_query(
+        self, max_distance: Optional[float] = None, limit: Optional[int] = None
+    ) -> SuggestionSession:
+        """Start a query which is typed one letter at a time, as in a search box. The
+            suggestions are got with `update(...)` of the session after every change of
+            the query word, and only the letters after the prefix it shares with the
+            previous query word are searched
+
+        Args:
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the query word. Defaults to None, the default of `get_suggestions(...)`
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
+
+        Returns:
+            SuggestionSession: The session of the query
+        """
+
+        if max_distance is None:
+            max_distance = self._get_default_max_distance()
+        return SuggestionSession(self, max_distance, limit)
+
+    def get_suggestions_batch(
+        self,
+        words: Iterable[str],
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        window: int = 100000,
+    ) -> Iterator[List[dict]]:
+        """Get the suggestions of many query words, such as the tokens of a corpus, lazily
+            and in their order. The query words which are pre-processed to the same
+            form are searched once, as long as they are at most `window` distinct
+            words apart. The other ones are searched in chunks by a pool of worker
+            processes, forked when the iteration starts so that they inherit the
+            indexed words instead of receiving a copy. The workers keep searching the
+            words indexed at that time. A `compact` dictionary, or one loaded with
+            `load(...)`, is shared best, as the forked processes hardly write to its
+            memory. Without `fork` (on Windows) the words are searched in this process
+
+        Args:
+            words (Iterable[str]): The query words
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the query words. Defaults to None, the default of `get_suggestions(...)`
+            limit (Optional[int], optional): The maximum number of suggestions per query word, the closest first. Defaults to None, which returns all the suggestions
+            workers (Optional[int], optional): The number of worker processes, 1 to search in this process. Defaults to None, the number of CPUs
+            chunk_size (int, optional): The number of query words sent to a worker at once. Defaults to 1000
+            window (int, optional): The number of most recent distinct query words whose suggestions are reused. Defaults to 100000
+
+        Raises:
+            ValueError: If `workers`, `chunk_size` or `window` is not positive
+
+        Returns:
+            Iterator[List[dict]]: The suggestions of every query word, as `get_suggestions(...)` returns them
+        """
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if max_distance is None:
+            max_distance = self._get_default_max_distance()
+
+        return self._iter_suggestions_batch(
+            iter(words), max_distance, limit, workers, chunk_size, window
+        )
+
+    def _iter_suggestions_batch(
+        self,
+        words: Iterator[str],
+        max_distance: float,
+        limit: Optional[int],
+        workers: int,
+        chunk_size: int,
+        window: int,
+    ) -> Iterator[List[dict]]:
+        """Search the query words chunk by chunk, see `get_suggestions_batch(...)`. Up to
+            two chunks per worker are searched ahead of the one being yielded
+
+        Args:
+            words (Iterator[str]): The query words
+            max_distance (float): The maximum distance between the words indexed and the query words
+            limit (Optional[int]): The maximum number of suggestions per query word, None for all the suggestions
+            workers (int): The number of worker processes, 1 to search in this process
+            chunk_size (int): The number of query words sent to a worker at once
+            window (int): The number of most recent distinct query words whose suggestions are reused
+
+        Yields:
+            List[dict]: The suggestions of every query word
+        """
+
+        executor = None
+        if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            executor = self._create_batch_executor(workers)
+
+        results = LRUCache(window)
+
+        # The suggestions (None until searched) of the pre-processed query words of the
+        # chunks not yielded yet, and their number of occurrences in these chunks
+        pending = dict()
+
+        # The pre-processed query words of every chunk not yielded yet, the ones which
+        # are searched with the chunk, and the future of their suggestions
+        chunks = deque()
+
+        try:
+            while True:
+                chunk = list(islice(words, chunk_size))
+                if chunk:
+                    processed_query_words = self._pre_process_many(chunk)
+                    queries = list()
+                    for processed_query_word in processed_query_words:
+                        entry = pending.get(processed_query_word)
+                        if entry is None:
+                            entry = [results.get(processed_query_word), 0]
+                            pending[processed_query_word] = entry
+                            if entry[0] is None:
+                                queries.append(processed_query_word)
+                        entry[1] += 1
+
+                    if executor is None:
+                        future = Future()
+                        future.set_result(
+                            _search_batch(self, queries, max_distance, limit)
+                        )
+                    else:
+                        future = executor.submit(
+                            _search_batch_in_worker, queries, max_distance, limit
+                        )
+                    chunks.append((processed_query_words, queries, future))
+
+                if not chunks:
+                    break
+                if chunk and executor is not None and len(chunks) <= 2 * workers:
+                    continue
+
+                processed_query_words, queries, future = chunks.popleft()
+                for processed_query_word, suggestions in zip(queries, future.result()):
+                    pending[processed_query_word][0] = suggestions
+                for processed_query_word in processed_query_words:
+                    entry = pending[processed_query_word]
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del pending[processed_query_word]
+                        results.put(processed_query_word, entry[0], results.generation)
+                    yield [
+                        {"word": word, "distance": distance}
+                        for word, distance in entry[0]
+                    ]
+        finally:
+            if executor is not None:
+                for _, _, future in chunks:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+    def _create_batch_executor(self, workers: int) -> ProcessPoolExecutor:
+        """Fork the worker processes of `get_suggestions_batch(...)` right away, so that
+            they inherit the indexed words. The objects of this process are kept away
+            from the garbage collector of the workers while they are forked, which
+            would otherwise write to (and so copy) the memory of every object it visits
+
+        Args:
+            workers (int): The number of worker processes
+
+        Returns:
+            ProcessPoolExecutor: The pool of workers
+        """
+
+        freeze = getattr(gc, "freeze", None)
+        if freeze is not None:
+            freeze()
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_batch_worker,
+                initargs=(self,),
+            )
+            executor.submit(_search_batch_in_worker, [], 0, None).result()
+        finally:
+            if freeze is not None:
+                gc.unfreeze()
+        return executor
+
+    def _get_default_max_distance(self) -> float:
+        """The default `max_distance` of `get_suggestions(...)`, which is not the same for
+            every algorithm
+
+        Returns:
+            float: The default maximum distance
+        """
+
+        parameters = inspect.signature(self.get_suggestions).parameters
+        return parameters["max_distance"].default
+
+    def _get_misspelt_query(self, word: str) -> Optional[str]:
+        """Get the query word of a word of a text, with its typographic apostrophes as
+            plain ones, unless it is indexed (ignoring its case). The words which are
+            not indexed are mostly told apart by `is_known(...)`
+
+        Args:
+            word (str): The word of the text
+
+        Returns:
+            Optional[str]: The query word, or None if the word is indexed
+        """
+
+        query_word = word.replace("\u2019", "'")
+        if self.is_known(query_word) and self._is_indexed(query_word):
+            return None
+        return query_word
+
+    def _is_indexed(self, word: str) -> bool:
+        """Check whether the word is indexed, ignoring its case, with a hash lookup
+
+        Args:
+            word (str): The word
+
+        Returns:
+            bool: Whether the word, or its lowercase form, is indexed
+        """
+
+        lowercase_word = word.lower()
+        for actual_word, _ in self._get_exact_matches(self._pre_process(word)):
+            if actual_word.lower() == lowercase_word:
+                return True
+        return False
+
+    def save(self, path: str) -> None:
+        """Save the indexed words to a binary file, to be loaded later with `load(...)`
+            instead of indexing the words again
+
+        Args:
+            path (str): The path to the file
+        """
+
+        dictionary = self._dictionary
+        if not isinstance(dictionary, CompactDictionary):
+            words = dictionary.iter_words()
+            dictionary = CompactDictionary()
+            dictionary.add_words(words)
+        dictionary.save(path, type(self).__name__)
+
+    def load(self, path: str, mmap: bool = True) -> None:
+        """Load the indexed words from a file written by `save(...)`, replacing the current
+            dictionary. The file must have been saved by the same algorithm
+
+        Args:
+            path (str): The path to the file
+            mmap (bool, optional): Whether to memory-map the file, so that the index is served straight from it and shared between processes. Defaults to True
+        """
+
+        dictionary = CompactDictionary.load(
+            path, algorithm=type(self).__name__, mmap=mmap
+        )
+        with self._write_lock:
+            self._dictionary = dictionary
+            self._filter = None
+            self._version += 1
+            self._invalidate_cache()
+
+    @property
+    def version(self) -> int:
+        """The version of the indexed words, incremented by every change"""
+
+        return self._version
+
+    def enable_cache(self, max_size: int = 10000) -> None:
+        """Cache the suggestions of the most recently used queries, keyed by the pre-processed
+            query word, `max_distance` and `limit`. Query words which are pre-processed to
+            the same form share their cached suggestions. The cache is cleared whenever the
+            indexed words change
+
+        Args:
+            max_size (int, optional): The maximum number of queries cached. Defaults to 10000
+        """
+
+        self._cache = LRUCache(max_size)
+
+    def disable_cache(self) -> None:
+        """Stop caching the suggestions and drop the cached ones"""
+
+        self._cache = None
+
+    def cache_info(self) -> Optional[dict]:
+        """Get the counters of the query cache
+
+        Returns:
+            Optional[dict]: The hits, misses, evictions, current size and maximum size of the cache, None if the cache is disabled
+        """
+
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def enable_stats(
+        self, hooks: Optional[List[Callable[[dict], None]]] = None
+    ) -> None:
+        """Record the statistics of every query of `get_suggestions(...)`: the numbers of
+            Trie nodes visited, of cells of the rows computed, of subtrees pruned and of
+            candidates returned, and its wall time. They are passed to the hooks, such as
+            an exporter to a metrics system, and added up, see `stats_info(...)`. The
+            Trie counters are only recorded by the "dp" engine, and are None otherwise
+
+        Args:
+            hooks (Optional[List[Callable[[dict], None]]], optional): The functions called with the statistics of every query, see `SearchStats`. Defaults to None
+        """
+
+        self._stats = SearchStats(hooks)
+
+    def disable_stats(self) -> None:
+        """Stop recording the statistics of the queries and drop the recorded ones"""
+
+        self._stats = None
+
+    def stats_info(self) -> Optional[dict]:
+        """Get the statistics of the queries added up since `enable_stats(...)`
+
+        Returns:
+            Optional[dict]: The numbers of queries, cached queries, Trie nodes visited, cells computed, subtrees pruned and candidates, and the total, mean and maximum wall time of the queries, None if the statistics are disabled
+        """
+
+        if self._stats is None:
+            return None
+        return self._stats.info()
+
+    def _invalidate_cache(self) -> None:
+        """Drop the cached suggestions, which are stale once the indexed words change"""
+
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _get_suggestions(
+        self, query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[dict]:
+        """Get the suggestions of the query word, recording the statistics of the query
+            when they are enabled
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        stats = self._stats
+        if stats is not None:
+            return self._get_suggestions_with_stats(
+                stats, query_word, max_distance, limit
+            )
+        return self._lookup_suggestions(query_word, max_distance, limit, self._search)
+
+    def _get_suggestions_with_stats(
+        self,
+        stats: SearchStats,
+        query_word: str,
+        max_distance: int,
+        limit: Optional[int],
+    ) -> List[dict]:
+        """Get the suggestions of the query word and record the statistics of the query.
+            The Trie search finds the counters of the query in a thread-local variable
+
+        Args:
+            stats (SearchStats): The statistics of the queries
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        local = self._stats_local
+        counts = {"nodes": None, "cells": None, "pruned": None}
+        searched = list()
+
+        def search(
+            processed_query_word: str, max_distance: int, limit: Optional[int]
+        ) -> List[dict]:
+            """Search for the suggestions with `_search(...)`, counting into `counts`
+
+            Args:
+                processed_query_word (str): The pre-processed query word
+                max_distance (int): The maximum distance between the words indexed and the query word
+                limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+            Returns:
+                List[dict]: The word suggestions with their corresponding distances
+            """
+
+            searched.append(processed_query_word)
+            local.counts = counts
+            try:
+                return self._search(processed_query_word, max_distance, limit)
+            finally:
+                local.counts = None
+
+        start_time = time.perf_counter()
+        suggestions = self._lookup_suggestions(query_word, max_distance, limit, search)
+        query_time = time.perf_counter() - start_time
+
+        query_stats = {
+            "query_word": query_word,
+            "max_distance": max_distance,
+            "limit": limit,
+            "cached": not searched,
+            "candidates": len(suggestions),
+            "time": query_time,
+        }
+        query_stats.update(counts)
+        stats.record(query_stats)
+        return suggestions
+
+    def _get_query_counts(self) -> Optional[dict]:
+        """Get the counters of the query being searched by this thread, when the
+            statistics are enabled, see `enable_stats(...)`
+
+        Returns:
+            Optional[dict]: The counters of the query, or None if they are not recorded
+        """
+
+        if self._stats is None:
+            return None
+        counts = getattr(self._stats_local, "counts", None)
+        if counts is not None and counts["nodes"] is None:
+            counts.update(nodes=0, cells=0, pruned=0)
+        return counts
+
+    def _lookup_suggestions(
+        self,
+        query_word: str,
+        max_distance: int,
+        limit: Optional[int],
+        search: Callable[[str, int, Optional[int]], List[dict]],
+    ) -> List[dict]:
+        """Pre-process the query word and search for its suggestions, going through the
+            query cache when it is enabled
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+            search (Callable[[str, int, Optional[int]], List[dict]]): Searches for the suggestions of a pre-processed query word, like `_search(...)`
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        processed_query_word = self._pre_process(query_word)
+
+        cache = self._cache
+        if cache is None:
+            return search(processed_query_word, max_distance, limit)
+
+        # The suggestions are cached as tuples, so the callers get their own dicts
+        key = (processed_query_word, max_distance, limit)
+        cached = cache.get(key)
+        if cached is None:
+            generation = cache.generation
+            suggestions = search(processed_query_word, max_distance, limit)
+            cache.put(
+                key,
+                tuple((item["word"], item["distance"]) for item in suggestions),
+                generation,
+            )
+            return suggestions
+
+        return [{"word": word, "distance": distance} for word, distance in cached]
+
+    def _search(
+        self, processed_query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[dict]:
+        """Search for the suggestions of the pre-processed query word, see
+            `_search_candidates(...)`
+
+        Args:
+            processed_query_word (str): The pre-processed query word
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        return [
+            {"word": word, "distance": distance}
+            for distance, _, word in self._search_candidates(
+                processed_query_word, max_distance, limit
+            )
+        ]
+
+    def _search_candidates(
+        self, processed_query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[Tuple[float, float, str]]:
+        """Search the Trie dictionary for the suggestions of the pre-processed query word,
+            with the edit costs given by the cost model of the algorithm. The Trie is
+            walked depth-first with an explicit stack, reusing one row per depth, or
+            one depth at a time by the "numpy" engine. When inserting or deleting a letter
+            has a cost, the nodes whose words are all too short or too long for the
+            maximum distance are skipped, and only the cells of the rows whose column is
+            close enough to the depth of the node are computed (Ukkonen's band)
+
+        Args:
+            processed_query_word (str): The pre-processed query word
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked
+        """
+
+        # The whole search uses the version of the dictionary current at its start
+        dictionary = self._dictionary
+        cost_model = self._cost_model
+        if self._engine == "numpy" and limit is None:
+            return vectorized_search(
+                dictionary, cost_model, processed_query_word, max_distance
+            )
+
+        query_length = len(processed_query_word)
+
+        # The costs which only depend on the query word are computed once per query
+        insert_costs = cost_model.insert_costs(processed_query_word)
+        replace_rows = dict()
+
+        # A word whose length differs from the query word's by more than the band is
+        # too far, and so is every cell whose column differs from its depth by more
+        # than the band. These cells are never computed and stay infinite. The lengths
+        # are only checked when some indexed words are out of the band
+        infinity = float("inf")
+        band = cost_model.max_length_difference(insert_costs, max_distance)
+        lengths = get_length_bounds(dictionary, query_length, band)
+        if band is None:
+            band = infinity
+
+        def fill_row(
+            parent_source_letter: Optional[str],
+            current_source_letter: str,
+            previous_row: list,
+            current_row: list,
+            depth: int,
+        ) -> float:
+            """Compute the row of a node in the dynamic-programming approach
+
+            Args:
+                parent_source_letter (Optional[str]): The letter of the parent node, None for the root
+                current_source_letter (str): The letter of the node
+                previous_row (list): The row of the parent node
+                current_row (list): The row of the node, which is overwritten within the band
+                depth (int): The depth of the node
+
+            Returns:
+                float: The smallest value of the row
+            """
+
+            delete_cost = cost_model.delete_cost(
+                parent_source_letter, current_source_letter
+            )
+            replace_row = replace_rows.get(current_source_letter)
+            if replace_row is None:
+                replace_row = replace_rows[current_source_letter] = (
+                    cost_model.replace_costs(
+                        current_source_letter, processed_query_word
+                    )
+                )
+
+            start = depth - band
+            stop = depth + band
+            if stop > query_length:
+                stop = query_length
+            if start <= 1:
+                start = 1
+                value = previous_row[0] + delete_cost
+                current_row[0] = minimum = value
+            else:
+                value = minimum = infinity
+            for i in range(start, stop + 1):
+                left = value + insert_costs[i]
+                value = previous_row[i] + delete_cost
+                if left < value:
+                    value = left
+                diagonal = previous_row[i - 1] + replace_row[i]
+                if diagonal < value:
+                    value = diagonal
+                current_row[i] = value
+                if value < minimum:
+                    minimum = value
+
+            return minimum
+
+        first_row = [0]
+        for i in range(1, query_length + 1):
+            first_row.append(first_row[i - 1] + insert_costs[i])
+
+        counts = self._get_query_counts()
+        if counts is not None:
+            fill_row = _count_rows(fill_row, counts, band, query_length, max_distance)
+
+        if limit is not None:
+
+            def next_row(
+                parent_source_letter: Optional[str],
+                current_source_letter: str,
+                previous_row: list,
+                depth: int,
+            ) -> list:
+                """Compute a new row of a node, as the rows are kept in the heap
+
+                Args:
+                    parent_source_letter (Optional[str]): The letter of the parent node, None for the root
+                    current_source_letter (str): The letter of the node
+                    previous_row (list): The row of the parent node
+                    depth (int): The depth of the node
+
+                Returns:
+                    list: The row of the node
+                """
+
+                current_row = [infinity] * (query_length + 1)
+                fill_row(
+                    parent_source_letter,
+                    current_source_letter,
+                    previous_row,
+                    current_row,
+                    depth,
+                )
+                return current_row
+
+            return self._best_first_search(
+                dictionary, first_row, next_row, max_distance, limit, lengths, counts
+            )
+
+        return self._depth_first_search(
+            dictionary, first_row, fill_row, max_distance, lengths, counts
+        )
+
+    def _depth_first_search(
+        self,
+        dictionary: Dictionary,
+        first_row: list,
+        fill_row: Callable[[Optional[str], str, list, list, int], float],
+        max_distance: int,
+        lengths: Optional[Tuple[float, float]],
+        counts: Optional[dict] = None,
+    ) -> List[Tuple[float, float, str]]:
+        """Search the whole Trie dictionary depth-first with an explicit stack, reusing
+            one row per depth
+
+        Args:
+            dictionary (Dictionary): The root of the Trie dictionary
+            first_row (list): The row of the root in the dynamic-programming approach
+            fill_row (Callable[[Optional[str], str, list, list, int], float]): Computes the row of a node from the letter of its parent (None for the root), its letter, the row of its parent, the row to overwrite and its depth, and returns its smallest value
+            max_distance (int): The maximum distance between the words indexed and the query word
+            lengths (Optional[Tuple[float, float]]): The shortest and the longest words which can be within the maximum distance, the nodes without such words being skipped. None for no bounds
+            counts (Optional[dict], optional): The statistics of the query, whose subtrees `pruned` by their lengths are counted. Defaults to None
+
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked
+        """
+
+        suggestions = list()
+
+        # The rows of the nodes on the current path, one per depth, and the iterators
+        # over the children of the nodes whose children are being searched
+        rows = [first_row]
+        parent_source_letters = [None]
+        stack = [iter(dictionary.children.items())]
+        while stack:
+            depth = len(stack)
+            for current_source_letter, child_node in stack[-1]:
+                if lengths is not None and (
+                    depth + child_node.min_length > lengths[1]
+                    or depth + child_node.max_length < lengths[0]
+                ):
+                    if counts is not None:
+                        counts["pruned"] += 1
+                    continue
+
+                if depth == len(rows):
+                    rows.append([float("inf")] * len(first_row))
+                current_row = rows[depth]
+                minimum = fill_row(
+                    parent_source_letters[-1],
+                    current_source_letter,
+                    rows[depth - 1],
+                    current_row,
+                    depth,
+                )
+
+                if (
+                    current_row[-1] <= max_distance
+                    and child_node.words_at_node is not None
+                ):
+                    for word, frequency in zip(
+                        child_node.words_at_node, child_node.frequencies_at_node
+                    ):
+                        suggestions.append((current_row[-1], frequency, word))
+
+                if minimum <= max_distance:
+                    stack.append(iter(child_node.children.items()))
+                    parent_source_letters.append(current_source_letter)
+                    break
+            else:
+                stack.pop()
+                parent_source_letters.pop()
+
+        return rank_candidates(suggestions)
+
+    def _get_exact_matches(self, processed_word: str) -> List[Tuple[str, float]]:
+        """Get the words whose pre-processed form is exactly the given one, by following
+            its letters down the Trie dictionary, so that a lookup only reads the few
+            nodes of its path
+
+        Args:
+            processed_word (str): The pre-processed word
+
+        Returns:
+            List[Tuple[str, float]]: The words indexed with the same pre-processed form, with their frequencies
+        """
+
+        return self._dictionary.get_words(processed_word)
+
+    def _best_first_search(
+        self,
+        dictionary: Dictionary,
+        first_row: list,
+        next_row: Callable[[Optional[str], str, list, int], list],
+        max_distance: int,
+        limit: int,
+        lengths: Optional[Tuple[float, float]] = None,
+        counts: Optional[dict] = None,
+    ) -> List[Tuple[float, float, str]]:
+        """Search the Trie dictionary for the closest words first, stopping as soon as
+            `limit` suggestions are certain. The nodes are expanded from a heap ordered by
+            the smallest value of their row and then the largest frequency below them,
+            which no word below the node can beat, so the suggestions come out in the same
+            order as the ranked full search and the nodes which cannot make it into the
+            top `limit` suggestions are never expanded
+
+        Args:
+            dictionary (Dictionary): The root of the Trie dictionary
+            first_row (list): The row of the root in the dynamic-programming approach
+            next_row (Callable[[Optional[str], str, list, int], list]): Computes the row of a node from the letter of its parent (None for the root), its letter, the row of its parent and its depth
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (int): The maximum number of suggestions to return
+            lengths (Optional[Tuple[float, float]], optional): The shortest and the longest words which can be within the maximum distance, the nodes without such words being skipped. Defaults to None, no bounds
+            counts (Optional[dict], optional): The statistics of the query, whose subtrees `pruned` by their lengths are counted. Defaults to None
+
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the closest suggestions, ranked
+        """
+
+        suggestions = list()
+        if limit <= 0:
+            return suggestions
+
+        # Node entries are (row minimum, -largest frequency, Trie order, 1, 0, letter,
+        # node, row) and word entries are (distance, -frequency, Trie order, 0, word
+        # index, word). Ties are broken by the depth-first order of the Trie, like the
+        # full search
+        heap = [
+            (
+                min(first_row),
+                -dictionary.max_frequency,
+                (),
+                1,
+                0,
+                None,
+                dictionary,
+                first_row,
+            )
+        ]
+        while heap:
+            entry = heapq.heappop(heap)
+            if entry[3] == 0:
+                suggestions.append((entry[0], -entry[1], entry[5]))
+                if len(suggestions) >= limit:
+                    break
+                continue
+
+            _, _, order, _, _, parent_source_letter, dictionary_node, previous_row = (
+                entry
+            )
+            depth = len(order) + 1
+            for index, (current_source_letter, child_node) in enumerate(
+                dictionary_node.children.items()
+            ):
+                if lengths is not None and (
+                    depth + child_node.min_length > lengths[1]
+                    or depth + child_node.max_length < lengths[0]
+                ):
+                    if counts is not None:
+                        counts["pruned"] += 1
+                    continue
+
+                current_row = next_row(
+                    parent_source_letter, current_source_letter, previous_row, depth
+                )
+                child_order = order + (index,)
+
+                if current_row[-1] <= max_distance and child_node.words_at_node:
+                    for word_index, (word, frequency) in enumerate(
+                        zip(child_node.words_at_node, child_node.frequencies_at_node)
+                    ):
+                        heapq.heappush(
+                            heap,
+                            (
+                                current_row[-1],
+                                -frequency,
+                                child_order,
+                                0,
+                                word_index,
+                                word,
+                            ),
+                        )
+
+                minimum = min(current_row)
+                if minimum <= max_distance:
+                    heapq.heappush(
+                        heap,
+                        (
+                            minimum,
+                            -child_node.max_frequency,
+                            child_order,
+                            1,
+                            0,
+                            current_source_letter,
+                            child_node,
+                            current_row,
+                        ),
+                    )
+
+        return suggestions
@@ -1,32 +1,45 @@
-from typing import List
+from typing import List, Optional
 
-from ..utils import sort_list
-from .base import Base
+from .phonetic import Phonetic
 
+# The letter replacements of the rules, as translation tables of bytes, which are
+# much faster than `str.translate(...)`
+_HARD_LETTERS = bytes.maketrans(b"cqxv", b"kkkf")
+_VOICED_LETTERS = bytes.maketrans(b"db", b"tp")
+_VOWELS = bytes.maketrans(b"aeiouzj", b"33333sy")
+_UPPER_LETTERS = bytes.maketrans(b"stpkfmn", b"STPKFMN")
+_DROPPED_LETTERS = b"whrl2"
+_REPEATED_LETTERS = tuple((letter * 2, letter) for letter in "stpkfmn")
 
-class CaverphoneTwo(Base):
+
+class CaverphoneTwo(Phonetic):
     """The Caverphone 2.0 algorithm class for for identifying English names which sound phonetically similar
 
     Reference: https://caversham.otago.ac.nz/files/working/ctp060902.pdf
     """
 
-    def __init__(self) -> None:
-        """The constructor for the class"""
+    def __init__(self, compact: bool = False, engine: str = "dp") -> None:
+        """The constructor for the class
 
-        super(CaverphoneTwo, self).__init__()
+        Args:
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary`, which uses much less memory, but whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used for the Trie search, either "dp" or "numpy" (rows of a whole depth of the Trie at once, needs NumPy). Defaults to "dp"
+        """
 
-    def _pre_process(self, word: str) -> str:
-        """Pre-processor for Caverphone 2.0
+        super(CaverphoneTwo, self).__init__(compact=compact, engine=engine)
+
+    def _encode(self, word: str) -> str:
+        """Encode a word into its Caverphone 2.0 code. The rules are applied in order,
+            but the ones which cannot affect each other are merged into single passes
 
         Args:
-            word (str): The word to be pre-processed
+            word (str): The word to be encoded
 
         Returns:
-            str: The pre-processed word
+            str: The Caverphone 2.0 code of the word
         """
 
-        word = word.lower()
-        word = "".join(_w for _w in word if _w in self._alphabet)
+        word = self._get_letters(word)
 
         if word[-1:] == "e":
             word = word[0:-1]
@@ -46,149 +59,78 @@ class CaverphoneTwo(Base):
         if word[-2:] == "mb":
             word = word[0:-2] + "m2"
 
-        word = word.replace("cq", "2q")
-        word = word.replace("ci", "si")
-        word = word.replace("ce", "se")
-        word = word.replace("cy", "sy")
-        word = word.replace("tch", "2ch")
-        word = word.replace("c", "k")
-        word = word.replace("q", "k")
-        word = word.replace("x", "k")
-        word = word.replace("v", "f")
-        word = word.replace("dg", "2g")
-        word = word.replace("tio", "sio")
-        word = word.replace("tia", "sia")
-        word = word.replace("d", "t")
-        word = word.replace("ph", "fh")
-        word = word.replace("b", "p")
-        word = word.replace("sh", "s2")
-        word = word.replace("z", "s")
+        word = (
+            word.replace("cq", "2q")
+            .replace("ci", "si")
+            .replace("ce", "se")
+            .replace("cy", "sy")
+            .replace("tch", "2ch")
+            .encode()
+            .translate(_HARD_LETTERS)
+            .replace(b"dg", b"2g")
+            .replace(b"tio", b"sio")
+            .replace(b"tia", b"sia")
+            .replace(b"ph", b"fh")
+            .translate(_VOICED_LETTERS)
+            .replace(b"sh", b"s2")
+            .decode()
+        )
 
         if word[0:1] in self._vowels:
             word = "A" + word[1:]
-        for _v in self._vowels:
-            word = word.replace(_v, "3")
-
-        word = word.replace("j", "y")
-        word = word.replace("y3", "Y3")
+        word = word.encode().translate(_VOWELS).replace(b"y3", b"Y3").decode()
 
-        if word[0:2] == "y3":
-            word = "Y3" + word[2:]
         if word[0] == "y":
             word = "A" + word[1:]
-
-        word = word.replace("y", "3")
-        word = word.replace("3gh3", "3kh3")
-        word = word.replace("gh", "22")
-        word = word.replace("g", "k")
-
-        for _w in "stpkfmn":
-            while _w * 2 in word:
-                word = word.replace(_w * 2, _w)
-            word = word.replace(_w, _w.upper())
-
-        word = word.replace("w3", "W3")
-        word = word.replace("wh3", "Wh3")
-
+        word = (
+            word.replace("y", "3")
+            .replace("3gh3", "3kh3")
+            .replace("gh", "22")
+            .replace("g", "k")
+        )
+        for repeated_letter, letter in _REPEATED_LETTERS:
+            while repeated_letter in word:
+                word = word.replace(repeated_letter, letter)
+        word = word.encode().translate(_UPPER_LETTERS).decode()
+
+        # The lower case "w", "h", "r" and "l" left become "2", which is dropped with
+        # them, as none of the rules in between can match them
+        word = word.replace("w3", "W3").replace("wh3", "Wh3")
         if word[-1:] == "w":
             word = word[0:-1] + "3"
 
-        word = word.replace("w", "2")
-
         if word[0:1] == "h":
             word = "A" + word[1:]
 
-        word = word.replace("h", "2")
         word = word.replace("r3", "R3")
-
         if word[-1:] == "r":
             word = word[0:-1] + "3"
 
-        word = word.replace("r", "2")
         word = word.replace("l3", "L3")
-
         if word[-1:] == "l":
             word = word[0:-1] + "3"
 
-        word = word.replace("l", "2")
-        word = word.replace("2", "")
+        word = word.encode().translate(None, _DROPPED_LETTERS).decode()
 
         if word[-1:] == "3":
             word = word[0:-1] + "A"
 
         word = word.replace("3", "")
-        word = word + "1" * 10
-        word = word[0:10]
-
-        return word
-
-    def _replace(self, a: str, b: str) -> float:
-        """Cost to replace the letter in query word with the target word
-
-        Args:
-            a (str): First letter
-            b (str): Second letter
-
-        Returns:
-            float: The cost to replace the letters
-        """
 
-        if a == b:
-            return 0
-        return 1
+        return (word + "1" * 10)[0:10]
 
-    def get_suggestions(self, query_word: str, max_distance: int = 0) -> List[dict]:
+    def get_suggestions(
+        self, query_word: str, max_distance: int = 0, limit: Optional[int] = None
+    ) -> List[dict]:
         """Get suggestions based on the edit-distance using dynamic-programming approach
 
         Args:
             query_word (str): The given query word for suggesting indexed words
             max_distance (int, optional): The maximum distance between the words indexed and the query word. Defaults to 0
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
 
         Returns:
             List[dict]: The word suggestions with their corresponding distances
         """
 
-        processed_query_word = self._pre_process(query_word)
-
-        def search(dictionary_node, previous_row):
-            """Search for the candidates in the given dictionary node's children
-
-            Args:
-                dictionary_node (Dictionary): The node in the Trie dictionary
-                previous_row (list): The previous row in the dynamic-programming approach
-            """
-
-            for current_source_letter in dictionary_node.children:
-                current_row = [previous_row[0] + 1]
-
-                for i in range(1, len(processed_query_word) + 1):
-                    value = min(
-                        previous_row[i] + 1,
-                        current_row[i - 1] + 1,
-                        previous_row[i - 1]
-                        + self._replace(
-                            current_source_letter, processed_query_word[i - 1]
-                        ),
-                    )
-                    current_row.append(value)
-
-                if (
-                    current_row[-1] <= max_distance
-                    and dictionary_node.children[current_source_letter].words_at_node
-                    is not None
-                ):
-                    for word in dictionary_node.children[
-                        current_source_letter
-                    ].words_at_node:
-                        suggestions.append({"word": word, "distance": current_row[-1]})
-
-                if min(current_row) <= max_distance:
-                    search(dictionary_node.children[current_source_letter], current_row)
-
-        suggestions = list()
-
-        first_row = range(0, len(processed_query_word) + 1)
-        search(self._dictionary, first_row)
-
-        suggestions = sort_list(suggestions, "distance")
-        return suggestions
+        return self._get_suggestions(query_word, max_distance, limit)
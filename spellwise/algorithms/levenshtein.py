@@ -1,9 +1,30 @@
-from typing import List
+from typing import List, Optional, Tuple
 
-from ..dictionary import Dictionary
-from ..utils import sort_list
+from ..utils import get_length_bounds, rank_candidates
 from .base import Base
 
+# Tables over 8 bits of the bit-vectors of a row, indexed by `pv_byte | mv_byte << 8`:
+# the sum of the +1/-1 differences and the minimum of their prefix sums
+_BYTE_SUM = None
+_BYTE_MIN_PREFIX = None
+
+
+def _build_byte_tables() -> None:
+    """Build the tables used to find the minimum of a bit-parallel row 8 cells at a time"""
+
+    global _BYTE_SUM, _BYTE_MIN_PREFIX
+
+    byte_sum = [0] * 65536
+    byte_min_prefix = [0] * 65536
+    for key in range(1, 65536):
+        delta = (key & 1) - ((key >> 8) & 1)
+        rest = ((key & 255) >> 1) | ((key >> 9) << 8)
+        byte_sum[key] = delta + byte_sum[rest]
+        byte_min_prefix[key] = delta + min(0, byte_min_prefix[rest])
+
+    _BYTE_SUM = byte_sum
+    _BYTE_MIN_PREFIX = byte_min_prefix
+
 
 class Levenshtein(Base):
     """The Levenshtein algorithm class for suggesting words based on edit-distance
@@ -11,78 +32,162 @@ class Levenshtein(Base):
     Reference: https://dl.acm.org/doi/10.1145/356827.356830
     """
 
-    def __init__(self) -> None:
-        """The constructor for the class"""
+    ENGINES = ("dp", "bitparallel", "numpy")
 
-        super(Levenshtein, self).__init__()
-
-    def _replace(self, a: str, b: str) -> float:
-        """Cost to replace the letter in query word with the target word
+    def __init__(self, compact: bool = False, engine: str = "dp") -> None:
+        """The constructor for the class
 
         Args:
-            a (str): First letter
-            b (str): Second letter
-
-        Returns:
-            float: The cost to replace the letters
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary`, which uses much less memory, but whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used to compute the edit-distances, either "dp" (dynamic-programming rows), "bitparallel" (Myers/Hyyro bit-vectors, faster for long query words) or "numpy" (rows of a whole depth of the Trie at once). Defaults to "dp"
         """
 
-        if a == b:
-            return 0
-        return 1
+        super(Levenshtein, self).__init__(compact=compact, engine=engine)
 
-    def get_suggestions(self, query_word: str, max_distance: int = 2) -> List[dict]:
+    def get_suggestions(
+        self, query_word: str, max_distance: int = 2, limit: Optional[int] = None
+    ) -> List[dict]:
         """Get suggestions based on the edit-distance using dynamic-programming approach
 
         Args:
             query_word (str): The given query word for suggesting indexed words
             max_distance (int, optional): The maximum distance between the words indexed and the query word. Defaults to 2
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
 
         Returns:
             List[dict]: The word suggestions with their corresponding distances
         """
 
-        processed_query_word = self._pre_process(query_word)
+        return self._get_suggestions(query_word, max_distance, limit)
+
+    def _search_candidates(
+        self, processed_query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[Tuple[float, float, str]]:
+        """Search the Trie dictionary for the suggestions of the pre-processed query word
+
+        Args:
+            processed_query_word (str): The pre-processed query word
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
 
-        def search(dictionary_node: Dictionary, previous_row: list):
-            """Search for the candidates in the given dictionary node's children
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked
+        """
 
-            Args:
-                dictionary_node (Dictionary): The node in the Trie dictionary
-                previous_row (list): The previous row in the dynamic-programming approach
-            """
+        if (
+            self._engine == "bitparallel"
+            and len(processed_query_word) > 0
+            and limit is None
+        ):
+            suggestions = self._bit_parallel_search(processed_query_word, max_distance)
+            return rank_candidates(suggestions)
+
+        return super(Levenshtein, self)._search_candidates(
+            processed_query_word, max_distance, limit
+        )
+
+    def _bit_parallel_search(
+        self, processed_query_word: str, max_distance: int
+    ) -> List[Tuple[int, float, str]]:
+        """Search the Trie dictionary computing the edit-distances with bit-vectors.
+            Every row of the dynamic-programming approach is kept as the positive and
+            negative differences between its adjacent cells (one bit per letter of the
+            query word), so each Trie edge costs a few integer operations. The nodes whose
+            words are all too short or too long for the maximum distance are skipped
 
-            for current_source_letter in dictionary_node.children:
-                current_row = [previous_row[0] + 1]
+        Args:
+            processed_query_word (str): The pre-processed query word (non-empty)
+            max_distance (int): The maximum distance between the words indexed and the query word
 
-                for i in range(1, len(processed_query_word) + 1):
-                    value = min(
-                        previous_row[i] + 1,
-                        current_row[i - 1] + 1,
-                        previous_row[i - 1]
-                        + self._replace(
-                            current_source_letter, processed_query_word[i - 1]
-                        ),
-                    )
-                    current_row.append(value)
+        Returns:
+            List[Tuple[int, float, str]]: The distance, frequency and word of every suggestion, in depth-first order
+        """
 
-                if (
-                    current_row[-1] <= max_distance
-                    and dictionary_node.children[current_source_letter].words_at_node
-                    is not None
-                ):
-                    for word in dictionary_node.children[
-                        current_source_letter
-                    ].words_at_node:
-                        suggestions.append({"word": word, "distance": current_row[-1]})
+        if _BYTE_SUM is None:
+            _build_byte_tables()
+        byte_sum = _BYTE_SUM
+        byte_min_prefix = _BYTE_MIN_PREFIX
+
+        query_length = len(processed_query_word)
+        dictionary = self._dictionary
+        # Every letter in excess of the query word's length costs 1
+        lengths = get_length_bounds(dictionary, query_length, max_distance)
+        mask = (1 << query_length) - 1
+        last_bit = 1 << (query_length - 1)
 
-                if min(current_row) <= max_distance:
-                    search(dictionary_node.children[current_source_letter], current_row)
+        match_masks = dict()
+        for i, letter in enumerate(processed_query_word):
+            match_masks[letter] = match_masks.get(letter, 0) | (1 << i)
 
         suggestions = list()
 
-        first_row = range(0, len(processed_query_word) + 1)
-        search(self._dictionary, first_row)
+        # Every entry is the iterator over the children of a node being searched, with
+        # the positive and negative bit-vectors and the last cell of the node's row
+        stack = [(iter(dictionary.children.items()), mask, 0, query_length)]
+        while stack:
+            children, positive_vector, negative_vector, distance = stack[-1]
+            depth = len(stack)
+            for current_source_letter, child_node in children:
+                if lengths is not None and (
+                    depth + child_node.min_length > lengths[1]
+                    or depth + child_node.max_length < lengths[0]
+                ):
+                    continue
+
+                match_mask = match_masks.get(current_source_letter, 0)
+
+                vertical = match_mask | negative_vector
+                horizontal = (
+                    ((match_mask & positive_vector) + positive_vector) ^ positive_vector
+                ) | match_mask
+                horizontal_positive = negative_vector | ~(horizontal | positive_vector)
+                horizontal_negative = positive_vector & horizontal
+
+                current_distance = distance
+                if horizontal_positive & last_bit:
+                    current_distance += 1
+                elif horizontal_negative & last_bit:
+                    current_distance -= 1
+
+                horizontal_positive = ((horizontal_positive << 1) | 1) & mask
+                horizontal_negative = (horizontal_negative << 1) & mask
+                current_positive = (
+                    horizontal_negative | ~(vertical | horizontal_positive)
+                ) & mask
+                current_negative = horizontal_positive & vertical
+
+                if current_distance <= max_distance:
+                    if child_node.words_at_node is not None:
+                        for word, frequency in zip(
+                            child_node.words_at_node, child_node.frequencies_at_node
+                        ):
+                            suggestions.append((current_distance, frequency, word))
+                    within = True
+                else:
+                    # Prune unless some cell of the row is within the maximum distance,
+                    # the first cell of the row being the depth of the node
+                    value = depth
+                    within = value <= max_distance
+                    positive = current_positive
+                    negative = current_negative
+                    while not within and (positive or negative):
+                        key = (positive & 255) | ((negative & 255) << 8)
+                        within = value + byte_min_prefix[key] <= max_distance
+                        value += byte_sum[key]
+                        positive >>= 8
+                        negative >>= 8
+
+                if within:
+                    stack.append(
+                        (
+                            iter(child_node.children.items()),
+                            current_positive,
+                            current_negative,
+                            current_distance,
+                        )
+                    )
+                    break
+            else:
+                stack.pop()
 
-        suggestions = sort_list(suggestions, "distance")
         return suggestions
@@ -0,0 +1,167 @@
+import re
+from abc import ABCMeta, abstractmethod
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from ..utils import rank_candidates
+from .base import Base
+
+# Everything but the letters is dropped from the words before they are encoded
+_NON_LETTERS = re.compile("[^a-z]+")
+
+
+class Phonetic(Base, metaclass=ABCMeta):
+    """The base class for the algorithms which index the phonetic code of every word,
+    given by `encode(...)`. The codes of the most recently encoded words can be
+    memoized with `enable_memo(...)`, which helps when the same words are indexed or
+    queried again and again
+    """
+
+    def __init__(self, compact: bool = False, engine: str = "dp") -> None:
+        """The constructor for the class
+
+        Args:
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary`, which uses much less memory, but whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used for the Trie search, either "dp" or "numpy" (rows of a whole depth of the Trie at once, needs NumPy). Defaults to "dp"
+        """
+
+        super(Phonetic, self).__init__(compact=compact, engine=engine)
+
+        self._encoder = self._encode
+
+    def encode(self, word: str) -> str:
+        """Encode a word into its phonetic code, the form in which it is indexed
+
+        Args:
+            word (str): The word to be encoded
+
+        Returns:
+            str: The phonetic code of the word
+        """
+
+        return self._encoder(word)
+
+    def encode_many(self, words: Iterable[str]) -> List[str]:
+        """Encode words into their phonetic codes, see `encode(...)`
+
+        Args:
+            words (Iterable[str]): The words to be encoded
+
+        Returns:
+            List[str]: The phonetic code of every word
+        """
+
+        return list(map(self._encoder, words))
+
+    def enable_memo(self, max_size: int = 100000) -> None:
+        """Memoize the codes of the most recently encoded words. The codes never change,
+            so the memo is kept when the indexed words change
+
+        Args:
+            max_size (int, optional): The maximum number of words whose codes are kept. Defaults to 100000
+        """
+
+        self._encoder = lru_cache(maxsize=max_size)(self._encode)
+
+    def disable_memo(self) -> None:
+        """Stop memoizing the codes of the encoded words and drop the memoized codes"""
+
+        self._encoder = self._encode
+
+    def memo_info(self) -> Optional[dict]:
+        """Get the statistics of the memo of the codes
+
+        Returns:
+            Optional[dict]: The hits, misses, current size and maximum size of the memo, or None if it is disabled
+        """
+
+        if self._encoder == self._encode:
+            return None
+
+        info = self._encoder.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    @abstractmethod
+    def _encode(self, word: str) -> str:
+        """Encode a word into its phonetic code, without the memo. The algorithms
+            implement their encoding
+
+        Args:
+            word (str): The word to be encoded
+
+        Returns:
+            str: The phonetic code of the word
+        """
+
+    def _get_letters(self, word: str) -> str:
+        """Lower-case the word and drop everything but its letters
+
+        Args:
+            word (str): The word
+
+        Returns:
+            str: The letters of the word
+        """
+
+        word = word.lower()
+        if _NON_LETTERS.search(word) is not None:
+            word = _NON_LETTERS.sub("", word)
+        return word
+
+    def _pre_process(self, word: str) -> str:
+        """Pre-processor for the phonetic algorithms, which encodes the word
+
+        Args:
+            word (str): The word to be pre-processed
+
+        Returns:
+            str: The pre-processed word
+        """
+
+        return self._encoder(word)
+
+    def _pre_process_many(self, words: List[str]) -> List[str]:
+        """Pre-process many words at once, see `encode_many(...)`
+
+        Args:
+            words (List[str]): The words to be pre-processed
+
+        Returns:
+            List[str]: The pre-processed words
+        """
+
+        return self.encode_many(words)
+
+    def _search_candidates(
+        self, processed_query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[Tuple[float, float, str]]:
+        """Search the Trie dictionary for the suggestions of the pre-processed query word.
+            The words of the same code, the only ones within a maximum distance of 0,
+            are looked up along the path of the code without searching the Trie
+
+        Args:
+            processed_query_word (str): The pre-processed query word
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked
+        """
+
+        if max_distance == 0:
+            suggestions = rank_candidates(
+                [
+                    (0, frequency, word)
+                    for word, frequency in self._get_exact_matches(processed_query_word)
+                ]
+            )
+            return suggestions[:limit]
+
+        return super(Phonetic, self)._search_candidates(
+            processed_query_word, max_distance, limit
+        )
@@ -0,0 +1,417 @@
+from typing import Any, List, Optional
+
+from ..utils import rank_suggestions
+
+_INFINITY = float("inf")
+
+
+class _Entry(object):
+    """A Trie node searched by a session, with its row for the query word typed so far"""
+
+    __slots__ = (
+        "node",
+        "letter",
+        "depth",
+        "index",
+        "parent",
+        "delete_cost",
+        "row",
+        "children",
+        "since",
+    )
+
+    def __init__(
+        self,
+        node: Any,
+        letter: Optional[str],
+        depth: int,
+        index: int,
+        parent: Optional["_Entry"],
+        delete_cost: float,
+        row: list,
+        since: int,
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            node (Dictionary): The Trie node
+            letter (Optional[str]): The letter of the node, None for the root
+            depth (int): The depth of the node
+            index (int): The index of the node among the children of its parent
+            parent (Optional[_Entry]): The entry of the parent node, None for the root
+            delete_cost (float): The cost to take the letter of the node without a letter of the query word
+            row (list): The row of the node, whose missing cells are beyond the maximum distance
+            since (int): The first column whose frontier the entry is in, if within the maximum distance
+        """
+
+        self.node = node
+        self.letter = letter
+        self.depth = depth
+        self.index = index
+        self.parent = parent
+        self.delete_cost = delete_cost
+        self.row = row
+        self.children = None
+        self.since = since
+
+    def get_order(self) -> tuple:
+        """The indices of the children on the path from the root, which give the
+            depth-first order of the Trie
+
+        Returns:
+            tuple: The indices
+        """
+
+        order = list()
+        entry = self
+        while entry.parent is not None:
+            order.append(entry.index)
+            entry = entry.parent
+        return tuple(reversed(order))
+
+
+class SuggestionSession(object):
+    """The suggestions for a query word which is typed one letter at a time, as in a
+    search box. The rows of the dynamic-programming approach are kept for all the
+    Trie nodes searched so far, so a letter typed at the end of the query word only
+    adds a cell to some rows, and a letter erased drops the last cell, instead of
+    searching the whole Trie again.
+
+    As the costs are not negative, a cell beyond the maximum distance only leads to
+    cells beyond it. So a letter typed only adds a cell to the rows of the nodes whose
+    last cell, or the last cell of their parent, is within the maximum distance, the
+    other cells being left out. When inserting or deleting a letter has a cost, the
+    nodes whose words are all too long for the query word typed so far are only
+    searched once it is long enough, and only the cells within Ukkonen's band are
+    computed for a new node.
+
+    The nodes are searched with the cost model of the algorithm, which gives the same
+    suggestions as `get_suggestions(...)`. A session serves a single user and is not
+    thread-safe, and it starts over when the indexed words change. Sessions are made
+    by `begin_query(...)` of the algorithms
+    """
+
+    def __init__(
+        self, algorithm: Any, max_distance: float, limit: Optional[int]
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            algorithm (Base): The algorithm whose indexed words are suggested
+            max_distance (float): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, the closest first. None for all the suggestions
+        """
+
+        self.max_distance = max_distance
+        self.limit = limit
+        self._algorithm = algorithm
+        self._cost_model = algorithm._cost_model
+        self._version = None
+        self._query_word = ""
+        self._insert_costs = [0]
+        self._replace_rows = dict()
+
+        # The band does not depend on the query word, as the insert costs are no less
+        # than the smallest delete cost
+        band = self._cost_model.max_length_difference([0], max_distance)
+        self._band = _INFINITY if band is None else band
+
+        # For every letter of the query word (and the empty one), the entries whose
+        # cell in its column is within the maximum distance, and the entries which
+        # got a cell in its column. The nodes whose children are left out as too long
+        # are kept by the length of the query word from which they are searched
+        self._frontiers = None
+        self._filled = None
+        self._deferred = dict()
+
+    @property
+    def query_word(self) -> str:
+        """The pre-processed query word of the last update"""
+
+        return self._query_word
+
+    def update(self, query_word: str) -> List[dict]:
+        """Get the suggestions for the query word as typed so far. Only the letters
+            after the prefix it shares with the previous query word are searched
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        processed_query_word = self._algorithm._pre_process(query_word)
+
+        if self._frontiers is None or self._version != self._algorithm.version:
+            self._start()
+
+        common_length = 0
+        for typed_letter, letter in zip(self._query_word, processed_query_word):
+            if typed_letter != letter:
+                break
+            common_length += 1
+
+        while len(self._query_word) > common_length:
+            self._erase_letter()
+        for letter in processed_query_word[common_length:]:
+            self._type_letter(letter)
+
+        return self._get_suggestions()
+
+    def _start(self) -> None:
+        """Search the current version of the indexed words for the empty query word"""
+
+        self._version = self._algorithm.version
+        self._query_word = ""
+        self._insert_costs = [0]
+        self._replace_rows = dict()
+        self._deferred = dict()
+
+        root = _Entry(self._algorithm._dictionary, None, 0, 0, None, 0, [0], 0)
+        self._frontiers = [[]]
+        self._filled = [[]]
+        if root.row[0] <= self.max_distance:
+            self._frontiers[0].append(root)
+        self._expand([root])
+
+    def _get_replace_row(self, letter: str) -> list:
+        """The costs to match a letter of the indexed words with every letter of the
+            query word, computed once per letter and query word
+
+        Args:
+            letter (str): The letter of the indexed words
+
+        Returns:
+            list: The cost for every letter of the query word, after a leading 0
+        """
+
+        replace_row = self._replace_rows.get(letter)
+        if replace_row is None:
+            replace_row = self._replace_rows[letter] = self._cost_model.replace_costs(
+                letter, self._query_word
+            )
+        return replace_row
+
+    def _type_letter(self, letter: str) -> None:
+        """Add a letter at the end of the query word, adding a cell to the rows which
+            can get one within the maximum distance, expanding the nodes which come
+            within it and searching the children which are no longer too long
+
+        Args:
+            letter (str): The letter of the pre-processed query word
+        """
+
+        query_word = self._query_word + letter
+        self._query_word = query_word
+        self._insert_costs = self._cost_model.insert_costs(query_word)
+        self._replace_rows = dict()
+        column = len(query_word)
+        insert_cost = self._insert_costs[column]
+        max_distance = self.max_distance
+
+        previous_frontier = self._frontiers[-1]
+        frontier = list()
+        filled = list()
+        self._frontiers.append(frontier)
+        self._filled.append(filled)
+
+        # The nodes whose last cell, or whose parent's, is within the maximum distance,
+        # by increasing depth so that the row of the parent is updated first. The rows
+        # of the nodes searched meanwhile already have a cell in the new column
+        depths = list()
+        for entry in previous_frontier:
+            while len(depths) <= entry.depth + 1:
+                depths.append(list())
+            depths[entry.depth].append(entry)
+            if entry.children is not None:
+                depths[entry.depth + 1].extend(entry.children)
+
+        depth = 0
+        while depth < len(depths):
+            for entry in depths[depth]:
+                row = entry.row
+                if len(row) > column:
+                    continue
+                while len(row) < column:
+                    self._filled[len(row)].append(entry)
+                    row.append(_INFINITY)
+
+                value = row[-1] + insert_cost
+                if entry.parent is not None:
+                    parent_row = entry.parent.row
+                    if len(parent_row) > column:
+                        vertical = parent_row[column] + entry.delete_cost
+                        if vertical < value:
+                            value = vertical
+                    if len(parent_row) >= column:
+                        diagonal = (
+                            parent_row[column - 1]
+                            + self._get_replace_row(entry.letter)[column]
+                        )
+                        if diagonal < value:
+                            value = diagonal
+                row.append(value)
+                filled.append(entry)
+
+                if value <= max_distance:
+                    frontier.append(entry)
+                    if entry.children is None:
+                        self._expand([entry])
+                    elif entry.children:
+                        if depth + 1 == len(depths):
+                            depths.append(list())
+                        depths[depth + 1].extend(entry.children)
+            depth += 1
+
+        expandable = list()
+        for parent in self._deferred.pop(column, set()):
+            expandable.extend(self._add_children(parent, column))
+        self._expand(expandable)
+
+    def _erase_letter(self) -> None:
+        """Remove the last letter of the query word, dropping the last cell of the rows
+        which got one. The nodes expanded for the longer query word stay expanded,
+        their rows being exact all the same, and the nodes searched for it enter the
+        frontier of the shorter one
+        """
+
+        column = len(self._query_word)
+        self._query_word = self._query_word[:-1]
+        self._insert_costs.pop()
+        self._replace_rows = dict()
+
+        self._frontiers.pop()
+        max_distance = self.max_distance
+        previous = column - 1
+        for entry in self._filled.pop():
+            row = entry.row
+            del row[column:]
+            if entry.since == column:
+                entry.since = previous
+                self._filled[-1].append(entry)
+                if len(row) > previous and row[previous] <= max_distance:
+                    self._frontiers[-1].append(entry)
+
+    def _expand(self, entries: List[_Entry]) -> None:
+        """Compute the rows of the children of nodes, and expand the children within
+            the maximum distance in turn
+
+        Args:
+            entries (List[_Entry]): The entries of the nodes
+        """
+
+        stack = list(entries)
+        while stack:
+            parent = stack.pop()
+            parent.children = list()
+            stack.extend(self._add_children(parent))
+
+    def _add_children(
+        self, parent: _Entry, length: Optional[int] = None
+    ) -> List[_Entry]:
+        """Compute the rows of the children of a node within the band, and add their
+            entries to the children of the node and to the frontier if they are within
+            the maximum distance. The children whose words are all too long for the
+            query word are left out until it is long enough
+
+        Args:
+            parent (_Entry): The entry of the node
+            length (Optional[int], optional): The length of the query word from which the children left out are searched, when it is reached. Defaults to None, to search the children of a node expanded
+
+        Returns:
+            List[_Entry]: The entries of the children to expand, whose rows come within the maximum distance
+        """
+
+        column = len(self._query_word)
+        band = self._band
+        max_distance = self.max_distance
+        insert_costs = self._insert_costs
+        delete_cost_of = self._cost_model.delete_cost
+        replace_rows = self._replace_rows
+        filled = self._filled[-1]
+        frontier = self._frontiers[-1]
+
+        parent_letter = parent.letter
+        entries = parent.children
+        depth = parent.depth + 1
+
+        # The cells out of the band are infinite, the ones after it left out, like the
+        # ones after the band of the parent
+        start = depth - band
+        stop = min(column, depth + band)
+        parent_row = parent.row
+        if len(parent_row) <= stop:
+            parent_row = parent_row + [_INFINITY] * (stop + 1 - len(parent_row))
+
+        expandable = list()
+        for index, (letter, node) in enumerate(parent.node.children.items()):
+            shortest = depth + node.min_length - band
+            if length is not None:
+                if shortest != length:
+                    continue
+            elif shortest > column:
+                self._deferred.setdefault(shortest, set()).add(parent)
+                continue
+
+            delete_cost = delete_cost_of(parent_letter, letter)
+            replace_row = replace_rows.get(letter)
+            if replace_row is None:
+                replace_row = self._get_replace_row(letter)
+
+            if start <= 0:
+                value = minimum = parent_row[0] + delete_cost
+                row = [value]
+                first = 1
+            else:
+                value = minimum = _INFINITY
+                row = [_INFINITY] * start
+                first = start
+            for i in range(first, stop + 1):
+                left = value + insert_costs[i]
+                value = parent_row[i] + delete_cost
+                if left < value:
+                    value = left
+                diagonal = parent_row[i - 1] + replace_row[i]
+                if diagonal < value:
+                    value = diagonal
+                row.append(value)
+                if value < minimum:
+                    minimum = value
+
+            child = _Entry(node, letter, depth, index, parent, delete_cost, row, column)
+            entries.append(child)
+            filled.append(child)
+            if stop == column and value <= max_distance:
+                frontier.append(child)
+            if minimum <= max_distance:
+                expandable.append(child)
+
+        return expandable
+
+    def _get_suggestions(self) -> List[dict]:
+        """Collect the suggestions from the nodes whose last cell is within the maximum
+        distance
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        column = len(self._query_word)
+        candidates = list()
+        for entry in self._frontiers[-1]:
+            node = entry.node
+            if node.words_at_node is not None:
+                order = entry.get_order()
+                distance = entry.row[column]
+                for index, (word, frequency) in enumerate(
+                    zip(node.words_at_node, node.frequencies_at_node)
+                ):
+                    candidates.append((order, index, distance, frequency, word))
+
+        # In the depth-first order of the Trie, like the search of the whole Trie, for
+        # the same order of ties
+        candidates.sort(key=lambda candidate: candidate[:2])
+        return rank_suggestions([candidate[2:] for candidate in candidates])[
+            : self.limit
+        ]
@@ -1,127 +1,65 @@
-from typing import List
+from typing import List, Optional
 
-from ..utils import sort_list
-from .base import Base
+from .phonetic import Phonetic
 
+# The digit of every letter, 0 for the letters which are dropped. The words are
+# translated as bytes, which is much faster than `str.translate(...)`
+_DIGITS = bytes.maketrans(
+    b"aeiouhwybfpvcgjkqsxzdtlmnr",
+    b"00000000111122222222334556",
+)
+_REPEATED_DIGITS = tuple((digit * 2, digit) for digit in "0123456")
 
-class Soundex(Base):
+
+class Soundex(Phonetic):
     """The Soundex algorithm class for for identifying English words which are phonetically similar
 
     Reference: https://nlp.stanford.edu/IR-book/html/htmledition/phonetic-correction-1.html
     """
 
-    def __init__(self) -> None:
-        """The constructor for the class"""
+    def __init__(self, compact: bool = False, engine: str = "dp") -> None:
+        """The constructor for the class
+
+        Args:
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary`, which uses much less memory, but whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used for the Trie search, either "dp" or "numpy" (rows of a whole depth of the Trie at once, needs NumPy). Defaults to "dp"
+        """
 
-        super(Soundex, self).__init__()
+        super(Soundex, self).__init__(compact=compact, engine=engine)
 
-    def _pre_process(self, word: str) -> str:
-        """Pre-processor for Soundex
+    def _encode(self, word: str) -> str:
+        """Encode a word into its Soundex code
 
         Args:
-            word (str): The word to be pre-processed
+            word (str): The word to be encoded
 
         Returns:
-            str: The pre-processed word
+            str: The Soundex code of the word
         """
 
-        word = word.lower()
-        word = "".join(_w for _w in word if _w in self._alphabet)
+        word = self._get_letters(word)
 
         first_letter = word[0]
-        word = word[1:]
-
-        for _w in "aeiouhwy":
-            word = word.replace(_w, "0")
-
-        for _w in "bfpv":
-            word = word.replace(_w, "1")
-        for _w in "cgjkqsxz":
-            word = word.replace(_w, "2")
-        for _w in "dt":
-            word = word.replace(_w, "3")
-        word = word.replace("l", "4")
-        for _w in "mn":
-            word = word.replace(_w, "5")
-        word = word.replace("r", "6")
-
-        for _w in "0123456789":
-            while _w * 2 in word:
-                word = word.replace(_w * 2, _w)
-
+        word = word[1:].encode().translate(_DIGITS).decode()
+        for repeated_digit, digit in _REPEATED_DIGITS:
+            while repeated_digit in word:
+                word = word.replace(repeated_digit, digit)
         word = word.replace("0", "")
-        word = first_letter + word + "0" * 3
-        word = word[0:4]
-
-        return word
-
-    def _replace(self, a: str, b: str) -> float:
-        """Cost to replace the letter in query word with the target word
-
-        Args:
-            a (str): First letter
-            b (str): Second letter
-
-        Returns:
-            float: The cost to replace the letters
-        """
 
-        if a == b:
-            return 0
-        return 1
+        return (first_letter + word + "0" * 3)[0:4]
 
-    def get_suggestions(self, query_word: str, max_distance: int = 0) -> List[dict]:
+    def get_suggestions(
+        self, query_word: str, max_distance: int = 0, limit: Optional[int] = None
+    ) -> List[dict]:
         """Get suggestions based on the edit-distance using dynamic-programming approach
 
         Args:
             query_word (str): The given query word for suggesting indexed words
             max_distance (int, optional): The maximum distance between the words indexed and the query word. Defaults to 0
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
 
         Returns:
             List[dict]: The word suggestions with their corresponding distances
         """
 
-        processed_query_word = self._pre_process(query_word)
-
-        def search(dictionary_node, previous_row):
-            """Search for the candidates in the given dictionary node's children
-
-            Args:
-                dictionary_node (Dictionary): The node in the Trie dictionary
-                previous_row (list): The previous row in the dynamic-programming approach
-            """
-
-            for current_source_letter in dictionary_node.children:
-                current_row = [previous_row[0] + 1]
-
-                for i in range(1, len(processed_query_word) + 1):
-                    value = min(
-                        previous_row[i] + 1,
-                        current_row[i - 1] + 1,
-                        previous_row[i - 1]
-                        + self._replace(
-                            current_source_letter, processed_query_word[i - 1]
-                        ),
-                    )
-                    current_row.append(value)
-
-                if (
-                    current_row[-1] <= max_distance
-                    and dictionary_node.children[current_source_letter].words_at_node
-                    is not None
-                ):
-                    for word in dictionary_node.children[
-                        current_source_letter
-                    ].words_at_node:
-                        suggestions.append({"word": word, "distance": current_row[-1]})
-
-                if min(current_row) <= max_distance:
-                    search(dictionary_node.children[current_source_letter], current_row)
-
-        suggestions = list()
-
-        first_row = range(0, len(processed_query_word) + 1)
-        search(self._dictionary, first_row)
-
-        suggestions = sort_list(suggestions, "distance")
-        return suggestions
+        return self._get_suggestions(query_word, max_distance, limit)
@@ -0,0 +1,359 @@
+import sys
+import time
+from typing import Any, List, Optional, Set, Tuple
+
+from ..utils import rank_candidates
+from .levenshtein import Levenshtein
+
+
+class SymSpell(Levenshtein):
+    """The Levenshtein algorithm with a SymSpell style deletion index. Every indexed word
+    is stored under all the strings obtained by deleting up to `max_index_distance`
+    letters from it, so a query only probes the index with its own deletions and then
+    verifies the few candidates found. The suggestions are exactly the ones of
+    `Levenshtein`, at the cost of a larger index
+
+    Reference: https://github.com/wolfgarbe/SymSpell
+    """
+
+    def __init__(
+        self, max_index_distance: int = 2, compact: bool = False, engine: str = "dp"
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            max_index_distance (int, optional): The maximum distance served by the deletion index, larger distances fall back to the Trie search. Defaults to 2
+            compact (bool, optional): Whether to index the words in an array based `CompactDictionary`, which uses much less memory, but whose arrays are rebuilt from all the words on the first search after words are added or removed. Defaults to False
+            engine (str, optional): The engine used for the Trie search, see `Levenshtein`. Defaults to "dp"
+        """
+
+        super(SymSpell, self).__init__(compact=compact, engine=engine)
+
+        self.MAX_INDEX_DISTANCE = max_index_distance
+        self._deletes = dict()
+        self._indexed_words = set()
+        self._staged_keys = None
+        self._build_time = 0.0
+
+    def _get_deletes(self, word: str, distance: int) -> Set[str]:
+        """Get all the strings obtained by deleting up to `distance` letters from the word
+
+        Args:
+            word (str): The word
+            distance (int): The maximum number of letters to delete
+
+        Returns:
+            Set[str]: The deletions, including the word itself
+        """
+
+        deletes = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {
+                deleted_word[:i] + deleted_word[i + 1 :]
+                for deleted_word in frontier
+                for i in range(len(deleted_word))
+            }
+            deletes.update(frontier)
+        return deletes
+
+    def _index_keys(
+        self, processed_words: List[str], deletes: dict, indexed_words: Set[str]
+    ) -> List[str]:
+        """Add the pre-processed words to a deletion index. Searches reading the lists of
+            the index at the same time may see the new words, which they skip when they
+            are not in their version of the Trie dictionary
+
+        Args:
+            processed_words (List[str]): The pre-processed words to index
+            deletes (dict): The deletion index, from every deletion to the pre-processed words
+            indexed_words (Set[str]): The pre-processed words in the deletion index
+
+        Returns:
+            List[str]: The pre-processed words which were not in the deletion index yet
+        """
+
+        start_time = time.perf_counter()
+
+        new_words = list()
+        for processed_word in processed_words:
+            if processed_word in indexed_words:
+                continue
+            indexed_words.add(processed_word)
+            new_words.append(processed_word)
+
+            for deleted_word in self._get_deletes(
+                processed_word, self.MAX_INDEX_DISTANCE
+            ):
+                keys = deletes.get(deleted_word)
+                if keys is None:
+                    deletes[deleted_word] = [processed_word]
+                else:
+                    keys.append(processed_word)
+
+        self._build_time += time.perf_counter() - start_time
+        return new_words
+
+    def _unindex_keys(self, processed_words: List[str]) -> None:
+        """Remove pre-processed words from the deletion index. The lists are replaced, as
+            removing from them could make the searches reading them at the same time
+            skip other words
+
+        Args:
+            processed_words (List[str]): The pre-processed words to remove, which are in the deletion index
+        """
+
+        for processed_word in processed_words:
+            self._indexed_words.discard(processed_word)
+            for deleted_word in self._get_deletes(
+                processed_word, self.MAX_INDEX_DISTANCE
+            ):
+                keys = [
+                    key for key in self._deletes[deleted_word] if key != processed_word
+                ]
+                if keys:
+                    self._deletes[deleted_word] = keys
+                else:
+                    del self._deletes[deleted_word]
+
+    def add_words(
+        self, words: List[str], frequencies: Optional[List[Optional[float]]] = None
+    ) -> None:
+        """Helper method to add words (index) to the dictionary and the deletion index
+
+        Args:
+            words (List[str]): The list of words to be indexed
+            frequencies (Optional[List[Optional[float]]], optional): The frequency of every word, see `Base.add_words(...)`. Defaults to None
+        """
+
+        with self._write_lock:
+            super(SymSpell, self).add_words(words, frequencies)
+
+            new_words = self._index_keys(
+                [self._pre_process(word) for word in words],
+                self._deletes,
+                self._indexed_words,
+            )
+            if self._staged_keys is not None:
+                self._staged_keys.extend(new_words)
+            self._invalidate_cache()
+
+    def add_from_path(self, path: str, batch_size: int = 10000) -> None:
+        """Helper method to add words (index) from a file to the dictionary and the
+            deletion index, see `Base.add_from_path(...)`. If the file cannot be read to
+            the end, the words read are removed from the deletion index as well
+
+        Args:
+            path (str): The path to the file
+            batch_size (int, optional): The number of words added at once. Defaults to 10000
+        """
+
+        with self._write_lock:
+            self._staged_keys = list()
+            try:
+                super(SymSpell, self).add_from_path(path, batch_size)
+            except BaseException:
+                self._unindex_keys(self._staged_keys)
+                self._invalidate_cache()
+                raise
+            finally:
+                self._staged_keys = None
+
+    def remove_words(self, words: List[str]) -> None:
+        """Helper method to remove indexed words from the dictionary and the deletion index
+
+        Args:
+            words (List[str]): The list of words to be removed
+        """
+
+        with self._write_lock:
+            super(SymSpell, self).remove_words(words)
+
+            self._unindex_keys(
+                [
+                    processed_word
+                    for processed_word in set(self._pre_process(word) for word in words)
+                    if processed_word in self._indexed_words
+                    and not self._get_exact_matches(processed_word)
+                ]
+            )
+            self._invalidate_cache()
+
+    def load(self, path: str, mmap: bool = True) -> None:
+        """Load the indexed words from a file written by `save(...)` and rebuild the
+            deletion index from them
+
+        Args:
+            path (str): The path to the file
+            mmap (bool, optional): Whether to memory-map the file. Defaults to True
+        """
+
+        with self._write_lock:
+            super(SymSpell, self).load(path, mmap=mmap)
+
+            # The new deletion index is built aside and then swapped in
+            deletes = dict()
+            indexed_words = set()
+            self._build_time = 0.0
+            self._index_keys(
+                [
+                    processed_word
+                    for processed_word, _, _ in self._dictionary.iter_words()
+                ],
+                deletes,
+                indexed_words,
+            )
+            self._deletes = deletes
+            self._indexed_words = indexed_words
+            self._invalidate_cache()
+
+    def get_index_stats(self) -> dict:
+        """Get the build-time and memory cost of the deletion index, to help choose
+            between `SymSpell` and `Levenshtein` for a deployment
+
+        Returns:
+            dict: The maximum distance served by the index, the number of deletions and of entries, the time spent building it (seconds) and its approximate size (bytes)
+        """
+
+        memory = sys.getsizeof(self._deletes)
+        num_entries = 0
+        for deleted_word, keys in self._deletes.items():
+            memory += sys.getsizeof(deleted_word) + sys.getsizeof(keys)
+            num_entries += len(keys)
+
+        return {
+            "max_index_distance": self.MAX_INDEX_DISTANCE,
+            "deletes": len(self._deletes),
+            "entries": num_entries,
+            "build_time": self._build_time,
+            "memory": memory,
+        }
+
+    def _distance(self, a: str, b: str, max_distance: int) -> int:
+        """The edit-distance between the words, stopping early once it exceeds the
+            maximum distance
+
+        Args:
+            a (str): First word
+            b (str): Second word
+            max_distance (int): The maximum distance of interest
+
+        Returns:
+            int: The edit-distance, or `max_distance + 1` when it is larger
+        """
+
+        if abs(len(a) - len(b)) > max_distance:
+            return max_distance + 1
+
+        previous_row = list(range(len(b) + 1))
+        for i, a_letter in enumerate(a, 1):
+            current_row = [i]
+            for j, b_letter in enumerate(b, 1):
+                current_row.append(
+                    min(
+                        previous_row[j] + 1,
+                        current_row[j - 1] + 1,
+                        previous_row[j - 1] + (a_letter != b_letter),
+                    )
+                )
+            if min(current_row) > max_distance:
+                return max_distance + 1
+            previous_row = current_row
+        return previous_row[-1]
+
+    def _find_in_trie(
+        self, dictionary: Any, processed_word: str
+    ) -> Optional[Tuple[Tuple[int, ...], Any]]:
+        """Find the node of the word in the Trie, with its position in the depth-first
+            order of the Trie as the indices of the children followed from the root
+
+        Args:
+            dictionary (Any): The root of the Trie dictionary, a `Dictionary` or a `CompactDictionary`
+            processed_word (str): The pre-processed word
+
+        Returns:
+            Optional[Tuple[Tuple[int, ...], Any]]: The indices of the children along the path of the word and its node, None if the word is not indexed
+        """
+
+        order = list()
+        dictionary_node = dictionary
+        for letter in processed_word:
+            children = dictionary_node.children
+            dictionary_node = children.get(letter)
+            if dictionary_node is None:
+                return None
+            order.append(list(children).index(letter))
+        if dictionary_node.words_at_node is None:
+            return None
+        return tuple(order), dictionary_node
+
+    def get_suggestions(
+        self, query_word: str, max_distance: int = 2, limit: Optional[int] = None
+    ) -> List[dict]:
+        """Get suggestions based on the edit-distance using the deletion index, or the
+            Trie search when `max_distance` exceeds the distance served by the index
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (int, optional): The maximum distance between the words indexed and the query word. Defaults to 2
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        return self._get_suggestions(query_word, max_distance, limit)
+
+    def _search_candidates(
+        self, processed_query_word: str, max_distance: int, limit: Optional[int]
+    ) -> List[Tuple[float, float, str]]:
+        """Search the deletion index for the suggestions of the pre-processed query word,
+            or the Trie dictionary when `max_distance` exceeds the distance served by the index
+
+        Args:
+            processed_query_word (str): The pre-processed query word
+            max_distance (int): The maximum distance between the words indexed and the query word
+            limit (Optional[int]): The maximum number of suggestions to return, None for all the suggestions
+
+        Returns:
+            List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked
+        """
+
+        if max_distance > self.MAX_INDEX_DISTANCE or max_distance < 0:
+            return super(SymSpell, self)._search_candidates(
+                processed_query_word, max_distance, limit
+            )
+
+        # The whole search uses the versions of the indexes current at its start
+        dictionary = self._dictionary
+        deletes = self._deletes
+
+        # The edit-distances are integers, so a fractional maximum distance allows as
+        # many deletions as its integral part
+        edits = int(max_distance)
+        candidates = dict()
+        for deleted_word in self._get_deletes(processed_query_word, edits):
+            for processed_word in deletes.get(deleted_word, []):
+                if processed_word not in candidates:
+                    candidates[processed_word] = self._distance(
+                        processed_query_word, processed_word, edits
+                    )
+
+        # Order the matches like the Trie search does, by distance and then Trie order
+        matches = list()
+        for processed_word, distance in candidates.items():
+            if distance <= max_distance:
+                found = self._find_in_trie(dictionary, processed_word)
+                if found is not None:
+                    matches.append((distance, found[0], found[1]))
+        matches.sort(key=lambda match: match[:2])
+
+        suggestions = list()
+        for distance, _, dictionary_node in matches:
+            for word, frequency in zip(
+                dictionary_node.words_at_node, dictionary_node.frequencies_at_node
+            ):
+                suggestions.append((distance, frequency, word))
+
+        suggestions = rank_candidates(suggestions)
+        return suggestions[:limit]
@@ -0,0 +1,159 @@
+from typing import List, Tuple
+
+from ..utils import get_length_bounds
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def vectorized_search(
+    dictionary, cost_model, processed_query_word: str, max_distance: float
+) -> List[Tuple[float, float, str]]:
+    """Search the Trie dictionary one depth at a time with NumPy. The rows of all the
+        nodes of a depth are computed together as a matrix, and the nodes whose row has
+        no value within the maximum distance are masked out of the next depth, as are the
+        nodes whose words are all too short or too long
+
+    Args:
+        dictionary (Dictionary): The root of the Trie dictionary
+        cost_model (CostModel): The costs of the edit operations
+        processed_query_word (str): The pre-processed query word
+        max_distance (float): The maximum distance between the words indexed and the query word
+
+    Returns:
+        List[Tuple[float, float, str]]: The distance, frequency and word of the suggestions, ranked like the depth-first search
+    """
+
+    insert_costs = cost_model.insert_costs(processed_query_word)
+    lengths = get_length_bounds(
+        dictionary,
+        len(processed_query_word),
+        cost_model.max_length_difference(insert_costs, max_distance),
+    )
+    insert_costs = numpy.asarray(insert_costs)
+
+    # A row is min(vertical or diagonal candidates, left cell + insert cost), so with
+    # the cumulative insert costs it is a running minimum along the row
+    cumulative_insert_costs = numpy.cumsum(insert_costs)
+    rows = cumulative_insert_costs[numpy.newaxis, :]
+
+    # The cost tables over the letters seen so far, the parent letter of the children
+    # of the root being the last index of the delete table
+    letters = list()
+    letter_indices = dict()
+    replace_table = None
+    delete_table = None
+
+    frontier = [dictionary]
+    frontier_letters = [-1]
+
+    # The parent of every node of every depth, and the nodes kept in the frontier of
+    # every depth, to recover the depth-first order of the suggestions
+    parents = list()
+    kept = list()
+
+    suggestions = list()
+    depth = 0
+    while frontier:
+        depth += 1
+        parent_indices = list()
+        child_letters = list()
+        children = list()
+        for parent_index, node in enumerate(frontier):
+            for letter, child_node in node.children.items():
+                if lengths is not None and (
+                    depth + child_node.min_length > lengths[1]
+                    or depth + child_node.max_length < lengths[0]
+                ):
+                    continue
+                letter_index = letter_indices.get(letter)
+                if letter_index is None:
+                    letter_index = letter_indices[letter] = len(letters)
+                    letters.append(letter)
+                    replace_table = None
+                parent_indices.append(parent_index)
+                child_letters.append(letter_index)
+                children.append(child_node)
+
+        if not children:
+            break
+        if replace_table is None:
+            replace_table = numpy.asarray(
+                [
+                    cost_model.replace_costs(letter, processed_query_word)
+                    for letter in letters
+                ]
+            )
+            delete_table = numpy.asarray(
+                [
+                    [
+                        cost_model.delete_cost(parent_letter, letter)
+                        for letter in letters
+                    ]
+                    for parent_letter in letters + [None]
+                ]
+            )
+
+        parent_letters = numpy.asarray(frontier_letters)[parent_indices]
+        previous_rows = rows[parent_indices]
+        vertical = (
+            previous_rows
+            + delete_table[parent_letters, child_letters][:, numpy.newaxis]
+        )
+        diagonal = previous_rows[:, :-1] + replace_table[child_letters, 1:]
+        candidates = numpy.concatenate(
+            (vertical[:, :1], numpy.minimum(vertical[:, 1:], diagonal)), axis=1
+        )
+        rows = (
+            numpy.minimum.accumulate(candidates - cumulative_insert_costs, axis=1)
+            + cumulative_insert_costs
+        )
+        parents.append(parent_indices)
+
+        distances = rows[:, -1]
+        for index in numpy.flatnonzero(distances <= max_distance).tolist():
+            child_node = children[index]
+            words = child_node.words_at_node
+            if words:
+                order = _get_order(parents, kept, index)
+                distance = distances[index].item()
+                for word_index, (word, frequency) in enumerate(
+                    zip(words, child_node.frequencies_at_node)
+                ):
+                    suggestions.append((distance, -frequency, order, word_index, word))
+
+        within = numpy.flatnonzero(rows.min(axis=1) <= max_distance)
+        rows = rows[within]
+        within = within.tolist()
+        kept.append(within)
+        frontier = [children[index] for index in within]
+        frontier_letters = [child_letters[index] for index in within]
+
+    suggestions.sort()
+    return [
+        (distance, -negative_frequency, word)
+        for distance, negative_frequency, _, _, word in suggestions
+    ]
+
+
+def _get_order(parents: List[list], kept: List[list], index: int) -> tuple:
+    """The position of a node in the depth-first order of the Trie, as the indices of
+        the node and its ancestors among the nodes of their depths
+
+    Args:
+        parents (List[list]): The parent of every node of every depth, as its index in the frontier
+        kept (List[list]): The indices of the nodes kept in the frontier of every depth
+        index (int): The index of the node among the nodes of the deepest depth
+
+    Returns:
+        tuple: The position of the node
+    """
+
+    order = [index]
+    for depth in range(len(parents) - 1, 0, -1):
+        index = kept[depth - 1][parents[depth][index]]
+        order.append(index)
+    order.reverse()
+    return tuple(order)
@@ -0,0 +1,14 @@
+# flake8: noqa
+
+__all__ = [
+    "ALGORITHMS",
+    "benchmark_algorithm",
+    "generate_lexicon",
+    "inject_typo",
+    "load_lexicon",
+    "make_queries",
+    "run_benchmarks",
+]
+
+from .lexicon import generate_lexicon, inject_typo, load_lexicon, make_queries
+from .runner import ALGORITHMS, benchmark_algorithm, run_benchmarks
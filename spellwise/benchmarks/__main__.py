@@ -0,0 +1,168 @@
+import argparse
+import json
+import sys
+from typing import List, Optional, Tuple
+
+from .lexicon import generate_lexicon, load_lexicon
+from .runner import ALGORITHMS, run_benchmarks
+
+DEFAULT_ALGORITHMS = [
+    "Levenshtein",
+    "Editex",
+    "Typox",
+    "Soundex",
+    "CaverphoneOne",
+    "CaverphoneTwo",
+]
+
+
+def _parse_list(value: str) -> List[int]:
+    """Parse a comma separated list of integers"""
+
+    return [int(item) for item in value.split(",") if item]
+
+
+def _parse_lengths(value: str) -> List[Tuple[int, int]]:
+    """Parse a comma separated list of length ranges like `1-4,5-8,9-`"""
+
+    length_ranges = list()
+    for item in value.split(","):
+        minimum, separator, maximum = item.partition("-")
+        minimum = int(minimum)
+        if not separator:
+            length_ranges.append((minimum, minimum))
+        else:
+            length_ranges.append((minimum, int(maximum) if maximum else 100))
+    return length_ranges
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Run the benchmarks from the command line and print the results as JSON"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m spellwise.benchmarks",
+        description="Benchmark the build time, memory, latency and throughput of the spellwise algorithms",
+    )
+    parser.add_argument(
+        "--algorithms",
+        default=",".join(DEFAULT_ALGORITHMS),
+        help="comma separated algorithms, among {} (default: %(default)s)".format(
+            ", ".join(ALGORITHMS)
+        ),
+    )
+    parser.add_argument(
+        "--lexicon",
+        help="word list to sample the dictionaries from (default: generated pseudo-words)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_parse_list,
+        default=[10000],
+        help="comma separated dictionary sizes (default: 10000)",
+    )
+    parser.add_argument(
+        "--query-lengths",
+        type=_parse_lengths,
+        default=[(1, 5), (6, 9), (10, 100)],
+        help="comma separated length ranges of the misspelt words (default: 1-5,6-9,10-)",
+    )
+    parser.add_argument(
+        "--max-distances",
+        type=_parse_list,
+        default=[0, 1, 2],
+        help="comma separated maximum distances (default: 0,1,2)",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=100,
+        help="number of queries per length range (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-edits",
+        type=int,
+        default=2,
+        help="maximum number of typos per query (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="maximum number of suggestions per query"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="index the words in the array based CompactDictionary",
+    )
+    parser.add_argument(
+        "--engine",
+        help="engine of the Trie search, e.g. numpy, or bitparallel for Levenshtein",
+    )
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="do not measure the peak memory (which builds every index twice)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument(
+        "--output", help="file to write the JSON results to (default: stdout)"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="do not print the progress to stderr"
+    )
+    arguments = parser.parse_args(args)
+
+    algorithms = [name for name in arguments.algorithms.split(",") if name]
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            parser.error("unknown algorithm '{}'".format(name))
+
+    options = dict()
+    for name in algorithms:
+        options[name] = dict()
+        if arguments.compact:
+            options[name]["compact"] = True
+        if arguments.engine and arguments.engine in ALGORITHMS[name].ENGINES:
+            options[name]["engine"] = arguments.engine
+
+    largest_size = max(arguments.sizes)
+    if arguments.lexicon:
+        lexicon = load_lexicon(arguments.lexicon, largest_size, seed=arguments.seed)
+    else:
+        lexicon = generate_lexicon(largest_size, seed=arguments.seed)
+
+    def progress(result: dict) -> None:
+        if not arguments.quiet:
+            sys.stderr.write(
+                "{algorithm:<14} size={dictionary_size:<8} length={query_length} "
+                "max_distance={max_distance} p50={p50:.3f}ms p99={p99:.3f}ms "
+                "qps={queries_per_second:.1f}\n".format(
+                    p50=result["p50_latency"] * 1000,
+                    p99=result["p99_latency"] * 1000,
+                    **result,
+                )
+            )
+
+    report = run_benchmarks(
+        lexicon,
+        algorithms,
+        arguments.sizes,
+        arguments.query_lengths,
+        arguments.max_distances,
+        num_queries=arguments.queries,
+        max_edits=arguments.max_edits,
+        limit=arguments.limit,
+        options=options,
+        measure_memory=not arguments.skip_memory,
+        seed=arguments.seed,
+        progress=progress,
+    )
+
+    output = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as fd:
+            fd.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import random
+from typing import List, Optional, Tuple
+
+from ..utils import read_words
+
+# The neighbouring keys of every letter on a QWERTY keyboard, used to inject typos
+KEYBOARD_NEIGHBOURS = {
+    "q": "wa",
+    "w": "qase",
+    "e": "wsdr",
+    "r": "edft",
+    "t": "rfgy",
+    "y": "tghu",
+    "u": "yhji",
+    "i": "ujko",
+    "o": "iklp",
+    "p": "ol",
+    "a": "qwsz",
+    "s": "awedxz",
+    "d": "serfcx",
+    "f": "drtgvc",
+    "g": "ftyhbv",
+    "h": "gyujnb",
+    "j": "huikmn",
+    "k": "jiolm",
+    "l": "kop",
+    "z": "asx",
+    "x": "zsdc",
+    "c": "xdfv",
+    "v": "cfgb",
+    "b": "vghn",
+    "n": "bhjm",
+    "m": "njk",
+}
+
+_CONSONANTS = "bcdfghjklmnprstvwz"
+_VOWELS = "aeiou"
+
+
+def load_lexicon(path: str, size: Optional[int] = None, seed: int = 0) -> List[str]:
+    """Load the distinct words of a word list file, optionally sampling some of them
+
+    Args:
+        path (str): The path to the file, in any format supported by `add_from_path(...)`
+        size (Optional[int], optional): The number of words to sample. Defaults to None, which keeps all the words
+        seed (int, optional): The seed of the sampling. Defaults to 0
+
+    Returns:
+        List[str]: The words
+    """
+
+    words = list(dict.fromkeys(word.lower() for word, _ in read_words(path)))
+    if size is not None and size < len(words):
+        words = random.Random(seed).sample(words, size)
+    return words
+
+
+def generate_lexicon(size: int, seed: int = 0) -> List[str]:
+    """Generate distinct pronounceable pseudo-words, with lengths similar to English words
+
+    Args:
+        size (int): The number of words to generate
+        seed (int, optional): The seed of the generator. Defaults to 0
+
+    Returns:
+        List[str]: The words
+    """
+
+    generator = random.Random(seed)
+    words = dict()
+    while len(words) < size:
+        length = max(1, min(20, int(generator.gauss(8, 2.5))))
+        letters = list()
+        while len(letters) < length:
+            letters.append(generator.choice(_CONSONANTS))
+            letters.append(generator.choice(_VOWELS))
+            if generator.random() < 0.3:
+                letters.append(generator.choice(_CONSONANTS))
+        words["".join(letters[:length])] = None
+    return list(words)
+
+
+def inject_typo(word: str, generator: random.Random, max_edits: int = 2) -> str:
+    """Misspell a word like a typist would, with 1 to `max_edits` edits among
+        substituting a neighbouring key, deleting, inserting a neighbouring key,
+        transposing or doubling letters
+
+    Args:
+        word (str): The word to misspell
+        generator (random.Random): The random generator to use
+        max_edits (int, optional): The maximum number of edits. Defaults to 2
+
+    Returns:
+        str: The misspelt word
+    """
+
+    letters = list(word)
+    for _ in range(generator.randint(1, max(1, max_edits))):
+        if not letters:
+            letters.append(generator.choice(_CONSONANTS + _VOWELS))
+            continue
+
+        position = generator.randrange(len(letters))
+        letter = letters[position]
+        operation = generator.choice(
+            ["substitute", "substitute", "delete", "insert", "transpose", "double"]
+        )
+        if operation == "substitute":
+            letters[position] = generator.choice(
+                KEYBOARD_NEIGHBOURS.get(letter, _VOWELS)
+            )
+        elif operation == "delete" and len(letters) > 1:
+            del letters[position]
+        elif operation == "insert":
+            letters.insert(
+                position, generator.choice(KEYBOARD_NEIGHBOURS.get(letter, _VOWELS))
+            )
+        elif operation == "transpose" and position + 1 < len(letters):
+            letters[position], letters[position + 1] = (
+                letters[position + 1],
+                letters[position],
+            )
+        else:
+            letters.insert(position, letter)
+    return "".join(letters)
+
+
+def make_queries(
+    words: List[str],
+    count: int,
+    length_range: Tuple[int, int] = (1, 100),
+    max_edits: int = 2,
+    seed: int = 0,
+) -> List[str]:
+    """Make misspelt queries from the words of the lexicon within a length range
+
+    Args:
+        words (List[str]): The words of the lexicon
+        count (int): The number of queries
+        length_range (Tuple[int, int], optional): The minimum and maximum length of the words to misspell. Defaults to (1, 100)
+        max_edits (int, optional): The maximum number of edits per query. Defaults to 2
+        seed (int, optional): The seed of the generator. Defaults to 0
+
+    Returns:
+        List[str]: The queries, empty if no word of the lexicon is within the length range
+    """
+
+    generator = random.Random(seed)
+    minimum_length, maximum_length = length_range
+    candidates = [
+        word for word in words if minimum_length <= len(word) <= maximum_length
+    ]
+    if not candidates:
+        return list()
+    return [
+        inject_typo(generator.choice(candidates), generator, max_edits)
+        for _ in range(count)
+    ]
@@ -0,0 +1,177 @@
+import gc
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..algorithms import ALGORITHMS
+from ..algorithms.base import Base
+from ..utils import get_percentile
+from .lexicon import make_queries
+
+
+def _build(factory: Callable[[], Base], words: List[str], measure_memory: bool):
+    """Build the index of an algorithm, measuring the time and optionally the peak memory
+
+    Args:
+        factory (Callable[[], Base]): Creates the algorithm instance
+        words (List[str]): The words to index
+        measure_memory (bool): Whether to measure the peak memory, in a second build
+
+    Returns:
+        Tuple[Base, float, Optional[int]]: The algorithm, the build time (seconds) and the peak memory (bytes)
+    """
+
+    gc.collect()
+    start_time = time.perf_counter()
+    algorithm = factory()
+    algorithm.add_words(words)
+    # Indexes built lazily are built by the first query
+    algorithm.get_suggestions(words[0] if words else "a", max_distance=0)
+    build_time = time.perf_counter() - start_time
+
+    peak_memory = None
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        traced_algorithm = factory()
+        traced_algorithm.add_words(words)
+        traced_algorithm.get_suggestions(words[0] if words else "a", max_distance=0)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced_algorithm
+
+    return algorithm, build_time, peak_memory
+
+
+def benchmark_algorithm(
+    algorithm: Base, queries: List[str], max_distance: int, limit: Optional[int] = None
+) -> dict:
+    """Measure the query latency and throughput of an algorithm with an index built
+
+    Args:
+        algorithm (Base): The algorithm, with the words indexed
+        queries (List[str]): The query words
+        max_distance (int): The maximum distance of the suggestions
+        limit (Optional[int], optional): The maximum number of suggestions per query. Defaults to None
+
+    Returns:
+        dict: The number of queries, p50/p99/mean latency (seconds), queries per second and mean number of suggestions
+    """
+
+    latencies = list()
+    num_suggestions = 0
+    start_time = time.perf_counter()
+    for query in queries:
+        query_start_time = time.perf_counter()
+        suggestions = algorithm.get_suggestions(
+            query, max_distance=max_distance, limit=limit
+        )
+        latencies.append(time.perf_counter() - query_start_time)
+        num_suggestions += len(suggestions)
+    total_time = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        "queries": len(queries),
+        "p50_latency": get_percentile(latencies, 50),
+        "p99_latency": get_percentile(latencies, 99),
+        "mean_latency": total_time / len(queries) if queries else 0.0,
+        "queries_per_second": len(queries) / total_time if total_time > 0 else 0.0,
+        "mean_suggestions": num_suggestions / len(queries) if queries else 0.0,
+    }
+
+
+def run_benchmarks(
+    lexicon: List[str],
+    algorithms: List[str],
+    dictionary_sizes: List[int],
+    query_lengths: List[Tuple[int, int]],
+    max_distances: List[int],
+    num_queries: int = 100,
+    max_edits: int = 2,
+    limit: Optional[int] = None,
+    options: Optional[Dict[str, dict]] = None,
+    measure_memory: bool = True,
+    seed: int = 0,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Run the benchmark sweeps over the algorithms, dictionary sizes, query lengths and
+        maximum distances
+
+    Args:
+        lexicon (List[str]): The words to index, the first `size` words are used for every dictionary size
+        algorithms (List[str]): The names of the algorithms, keys of `ALGORITHMS`
+        dictionary_sizes (List[int]): The numbers of words to index
+        query_lengths (List[Tuple[int, int]]): The length ranges of the words to misspell as queries
+        max_distances (List[int]): The maximum distances of the suggestions
+        num_queries (int, optional): The number of queries per length range. Defaults to 100
+        max_edits (int, optional): The maximum number of typos per query. Defaults to 2
+        limit (Optional[int], optional): The maximum number of suggestions per query. Defaults to None
+        options (Optional[Dict[str, dict]], optional): The keyword arguments of the constructor of each algorithm. Defaults to None
+        measure_memory (bool, optional): Whether to measure the peak memory of the build. Defaults to True
+        seed (int, optional): The seed of the query generation. Defaults to 0
+        progress (Optional[Callable[[dict], None]], optional): Called with every result as soon as it is measured. Defaults to None
+
+    Returns:
+        dict: The environment, the configuration and the list of results
+    """
+
+    options = options or dict()
+    results = list()
+    for size in dictionary_sizes:
+        words = lexicon[:size]
+        queries = {
+            length_range: make_queries(
+                words, num_queries, length_range, max_edits=max_edits, seed=seed
+            )
+            for length_range in query_lengths
+        }
+
+        for name in algorithms:
+            algorithm_class = ALGORITHMS[name]
+            algorithm_options = options.get(name, dict())
+
+            def factory() -> Base:
+                return algorithm_class(**algorithm_options)
+
+            algorithm, build_time, peak_memory = _build(factory, words, measure_memory)
+
+            for length_range in query_lengths:
+                for max_distance in max_distances:
+                    result = {
+                        "algorithm": name,
+                        "options": algorithm_options,
+                        "dictionary_size": len(words),
+                        "query_length": list(length_range),
+                        "max_distance": max_distance,
+                        "limit": limit,
+                        "build_time": build_time,
+                        "peak_memory": peak_memory,
+                    }
+                    result.update(
+                        benchmark_algorithm(
+                            algorithm, queries[length_range], max_distance, limit
+                        )
+                    )
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+
+            del algorithm
+
+    return {
+        "environment": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "lexicon_size": len(lexicon),
+            "num_queries": num_queries,
+            "max_edits": max_edits,
+            "seed": seed,
+        },
+        "results": results,
+    }
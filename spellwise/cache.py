@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache(object):
+    """Thread-safe, size bounded, least-recently-used cache with hit, miss and eviction
+    counters. Clearing the cache starts a new generation, and values computed during
+    an older generation are not stored, so a cleared cache never serves stale values
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """The constructor for the class
+
+        Args:
+            max_size (int): The maximum number of entries kept in the cache
+        """
+
+        if max_size <= 0:
+            raise ValueError("The cache size must be positive, got {}".format(max_size))
+
+        self.max_size = max_size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get the value cached for the key, marking it as the most recently used
+
+        Args:
+            key (Hashable): The key
+
+        Returns:
+            Optional[Any]: The cached value, or None if the key is not cached
+        """
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Cache the value for the key, evicting the least recently used entries when full
+
+        Args:
+            key (Hashable): The key
+            value (Any): The value, which must not be None
+            generation (int): The generation of the cache when the value started being computed
+        """
+
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all the entries and start a new generation"""
+
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def info(self) -> dict:
+        """Get the counters of the cache
+
+        Returns:
+            dict: The hits, misses, evictions, current size and maximum size of the cache
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
@@ -1,77 +1,1061 @@
-from typing import List, Tuple
+import struct
+import sys
+import threading
+from array import array
+from collections import deque
+from mmap import ACCESS_READ
+from mmap import mmap as memory_map
+from typing import Iterator, List, Optional, Tuple
+
+# The on-disk format of a saved `CompactDictionary` is a header with the magic bytes, the
+# format version and the name of the algorithm which pre-processed the keys, followed by
+# the byte lengths of the arrays and the arrays themselves (little-endian, 8-byte aligned).
+# Version 1 files, which have no word frequencies, and version 2 files, which have no
+# word length bounds, can still be loaded
+INDEX_MAGIC = b"SPWI"
+INDEX_FORMAT_VERSION = 3
+_INDEX_HEADER = struct.Struct("<4sHH")
+_INDEX_SECTIONS = {
+    1: struct.Struct("<5Q"),
+    2: struct.Struct("<7Q"),
+    3: struct.Struct("<9Q"),
+}
+# The type of the items of every array, the words being raw bytes
+_INDEX_TYPECODES = ("I", "I", "I", "I", None, "d", "d", "I", "I")
 
 
 class Dictionary(object):
-    """Trie based dictionary class for indexing words to consider for spelling correction"""
+    """Trie based dictionary class for indexing words to consider for spelling correction.
+
+    `add_words(...)` and `remove_words(...)` update the Trie in place, while
+    `with_words(...)` and `without_words(...)` leave it untouched and return a new Trie
+    sharing the unchanged nodes with it, so that it can still be searched meanwhile.
+    Every node made by such a change keeps the token of the change as its owner.
+
+    Every node also keeps the fewest and the most letters between it and the ends of
+    the words below it, so that the searches can skip the nodes whose words are all
+    too short or too long
+    """
+
+    __slots__ = (
+        "words_at_node",
+        "_frequencies",
+        "max_frequency",
+        "min_length",
+        "max_length",
+        "children",
+        "_owner",
+    )
 
     def __init__(self) -> None:
         self.words_at_node = None
+        self._frequencies = None
+        self.max_frequency = 0
+        self.min_length = 0
+        self.max_length = 0
         self.children = {}
+        self._owner = None
 
-    def add_words(self, words: List[Tuple[str, str]]) -> None:
-        """Add words to index to the Trie dictionary
+    def add_words(self, words: List[Tuple[str, str, Optional[float]]]) -> None:
+        """Add words to index to the Trie dictionary. Words which are already indexed are
+            skipped, but their frequency is updated when a new one is given. Every node
+            keeps the largest frequency of the words below it, and the bounds of their
+            lengths
 
         Args:
-            words (List[Tuple[str, str]]): The list of words to index to the dictionary
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies (None to keep the frequency, 0 for new words) to index to the dictionary
         """
 
+        self._add_words(words, None)
+
+    def _add_words(
+        self, words: List[Tuple[str, str, Optional[float]]], owner: Optional[object]
+    ) -> None:
+        """Add words to index to the Trie dictionary, see `add_words(...)`
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies to index to the dictionary
+            owner (Optional[object]): The token of the change, the nodes on the paths of the words with another owner being copied first. None to update all the nodes in place
+        """
+
+        if words and self.words_at_node is None and not self.children:
+            # The bounds of an empty Trie start from the first word
+            self.min_length = self.max_length = len(words[0][0])
+
         for word in words:
-            processed_word, actual_word = word
+            processed_word, actual_word, frequency = word
             trie_node = self
+            remaining = len(processed_word)
             for letter in processed_word:
-                if letter not in trie_node.children:
-                    trie_node.children.update({letter: Dictionary()})
-                trie_node = trie_node.children[letter]
+                if frequency and frequency > trie_node.max_frequency:
+                    trie_node.max_frequency = frequency
+                if remaining < trie_node.min_length:
+                    trie_node.min_length = remaining
+                elif remaining > trie_node.max_length:
+                    trie_node.max_length = remaining
+                remaining -= 1
+                child_node = trie_node.children.get(letter)
+                if child_node is None:
+                    child_node = trie_node.children[letter] = Dictionary()
+                    child_node.min_length = child_node.max_length = remaining
+                    child_node._owner = owner
+                elif owner is not None and child_node._owner is not owner:
+                    child_node = trie_node.children[letter] = child_node._copy(owner)
+                trie_node = child_node
+            if frequency and frequency > trie_node.max_frequency:
+                trie_node.max_frequency = frequency
+            trie_node.min_length = 0
 
+            # The frequencies are only kept once a word of the node has one, as most
+            # lexicons have none and the lists would slow down building the Trie
             if trie_node.words_at_node is None:
                 trie_node.words_at_node = list()
-            trie_node.words_at_node.append(actual_word)
-
-    # def remove_words(self, processed_words):
-    #     for word in processed_words:
-    #         word_exists = self.has_word(word)
-
-    #         # If the word exists in the Dictionary, iterate again and delete
-    #         if word_exists:
-    #             trie_node = self
-    #             for letter in word.lower():
-    #                 if letter in trie_node.children:
-    #                     child_trie_node = trie_node.children[letter]
-    #                     num_children = len(child_trie_node.children.keys())
-    #                     if (
-    #                         num_children == 1 and child_trie_node.words_at_node is None
-    #                     ) or (num_children == 0):
-    #                         _ = trie_node.children.pop(letter)
-    #                         break
-
-    #                     # Update trie node to iterate over the children
-    #                     trie_node = trie_node.children[letter]
-
-    # def has_word(self, word):
-    #     word_length = len(word)
-    #     trie_node = self
-    #     for i, letter in enumerate(word.lower()):
-    #         if letter in trie_node.children:
-    #             trie_node = trie_node.children[letter]
-    #             if i == word_length - 1:
-    #                 if trie_node.words_at_node is not None:
-    #                     return True
-    #                 else:
-    #                     return False
-    #         else:
-    #             return False
-
-    # def add_from_path(self, path=None):
-    #     if path is not None:
-    #         path_file = open(path, "r").read().split()
-    #         for word in path_file:
-    #             self.add_words([word.lower().strip()])
-
-
-# if __name__ == "__main__":
-#     dictionary = Dictionary()
-#     dictionary.add_words(["spell", "spelling", "checker"])
-
-#     assert dictionary.has_word("spell") is True
-#     dictionary.remove_words(["spell"])
-#     assert dictionary.has_word("spell") is False
+            if actual_word not in trie_node.words_at_node:
+                trie_node.words_at_node.append(actual_word)
+                if trie_node._frequencies is not None:
+                    trie_node._frequencies.append(frequency or 0)
+                elif frequency:
+                    trie_node._frequencies = [0] * len(trie_node.words_at_node)
+                    trie_node._frequencies[-1] = frequency
+            elif frequency is not None:
+                index = trie_node.words_at_node.index(actual_word)
+                if trie_node._frequencies is None:
+                    trie_node._frequencies = [0] * len(trie_node.words_at_node)
+                previous_frequency = trie_node._frequencies[index]
+                trie_node._frequencies[index] = frequency
+                if frequency < previous_frequency:
+                    self._update_path(processed_word)
+
+    @property
+    def frequencies_at_node(self) -> Optional[List[float]]:
+        """The frequencies of the words at the node, or None if there are no words"""
+
+        if self._frequencies is None and self.words_at_node is not None:
+            return [0] * len(self.words_at_node)
+        return self._frequencies
+
+    def iter_words(self) -> Iterator[Tuple[str, str, float]]:
+        """Iterate over the indexed words in depth-first order of the Trie
+
+        Yields:
+            Tuple[str, str, float]: The processed word (key), the actual word and its frequency
+        """
+
+        stack = [("", self)]
+        while stack:
+            prefix, trie_node = stack.pop()
+            if trie_node.words_at_node is not None:
+                for actual_word, frequency in zip(
+                    trie_node.words_at_node, trie_node.frequencies_at_node
+                ):
+                    yield prefix, actual_word, frequency
+            for letter, child_node in reversed(list(trie_node.children.items())):
+                stack.append((prefix + letter, child_node))
+
+    def remove_words(self, words: List[Tuple[str, str]]) -> None:
+        """Remove indexed words from the Trie dictionary. The nodes left without words
+            below them are removed, and the largest frequencies along the path of every
+            word are updated. Words which are not indexed are skipped
+
+        Args:
+            words (List[Tuple[str, str]]): The processed and actual words to remove from the dictionary
+        """
+
+        for processed_word, actual_word in words:
+            trie_node = self
+            for letter in processed_word:
+                trie_node = trie_node.children.get(letter)
+                if trie_node is None:
+                    break
+            if (
+                trie_node is None
+                or trie_node.words_at_node is None
+                or actual_word not in trie_node.words_at_node
+            ):
+                continue
+
+            index = trie_node.words_at_node.index(actual_word)
+            del trie_node.words_at_node[index]
+            if trie_node._frequencies is not None:
+                del trie_node._frequencies[index]
+            if not trie_node.words_at_node:
+                trie_node.words_at_node = None
+                trie_node._frequencies = None
+            self._update_path(processed_word)
+
+    def _update_path(self, processed_word: str) -> None:
+        """Update the nodes on the path of a processed word after its words changed,
+            removing the nodes left without words below them and recomputing the largest
+            frequencies and the bounds of the lengths, from the deepest node up to the root
+
+        Args:
+            processed_word (str): The processed word, which must have a node in the Trie
+        """
+
+        path = [self]
+        for letter in processed_word:
+            path.append(path[-1].children[letter])
+
+        for depth in range(len(processed_word), -1, -1):
+            trie_node = path[depth]
+            if depth > 0 and trie_node.words_at_node is None and not trie_node.children:
+                del path[depth - 1].children[processed_word[depth - 1]]
+                continue
+            trie_node.max_frequency = max(trie_node._frequencies or [0])
+            lengths = [
+                child_node.min_length + 1 for child_node in trie_node.children.values()
+            ]
+            if trie_node.words_at_node is not None:
+                lengths.append(0)
+            trie_node.min_length = min(lengths or [0])
+            trie_node.max_length = 0
+            for child_node in trie_node.children.values():
+                if child_node.max_frequency > trie_node.max_frequency:
+                    trie_node.max_frequency = child_node.max_frequency
+                if child_node.max_length >= trie_node.max_length:
+                    trie_node.max_length = child_node.max_length + 1
+
+    def with_words(
+        self,
+        words: List[Tuple[str, str, Optional[float]]],
+        owner: Optional[object] = None,
+    ) -> "Dictionary":
+        """Copy-on-write version of `add_words(...)`. Only the nodes on the paths of the
+            words are copied, all the other nodes are shared with this Trie
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies to index to the dictionary
+            owner (Optional[object], optional): The token of the change. The nodes it already made are updated in place, so that calls with the same token on the returned Trie make up a single change. Defaults to None, a new change
+
+        Returns:
+            Dictionary: The root of the new Trie
+        """
+
+        root = self._own(owner)
+        root._add_words(words, root._owner)
+        return root
+
+    def without_words(
+        self, words: List[Tuple[str, str]], owner: Optional[object] = None
+    ) -> "Dictionary":
+        """Copy-on-write version of `remove_words(...)`. Only the nodes on the paths of
+            the words are copied, all the other nodes are shared with this Trie
+
+        Args:
+            words (List[Tuple[str, str]]): The processed and actual words to remove from the dictionary
+            owner (Optional[object], optional): The token of the change, see `with_words(...)`. Defaults to None, a new change
+
+        Returns:
+            Dictionary: The root of the new Trie
+        """
+
+        root = self._own(owner)
+        for processed_word, _ in words:
+            trie_node = root
+            for letter in processed_word:
+                child_node = trie_node.children.get(letter)
+                if child_node is None:
+                    break
+                if child_node._owner is not root._owner:
+                    child_node = trie_node.children[letter] = child_node._copy(
+                        root._owner
+                    )
+                trie_node = child_node
+        root.remove_words(words)
+        return root
+
+    def _own(self, owner: Optional[object]) -> "Dictionary":
+        """Get the root of the Trie for a change, copying it unless the change made it
+
+        Args:
+            owner (Optional[object]): The token of the change, None for a new change
+
+        Returns:
+            Dictionary: The root owned by the change
+        """
+
+        if owner is None:
+            owner = object()
+        elif self._owner is owner:
+            return self
+        return self._copy(owner)
+
+    def _copy(self, owner: object) -> "Dictionary":
+        """Copy the node for a change, sharing its children
+
+        Args:
+            owner (object): The token of the change
+
+        Returns:
+            Dictionary: The copy of the node
+        """
+
+        trie_node = Dictionary()
+        if self.words_at_node is not None:
+            trie_node.words_at_node = list(self.words_at_node)
+            if self._frequencies is not None:
+                trie_node._frequencies = list(self._frequencies)
+        trie_node.max_frequency = self.max_frequency
+        trie_node.min_length = self.min_length
+        trie_node.max_length = self.max_length
+        trie_node.children = dict(self.children)
+        trie_node._owner = owner
+        return trie_node
+
+    def get_frequency(self, processed_word: str, actual_word: str) -> Optional[float]:
+        """Get the frequency of an indexed word
+
+        Args:
+            processed_word (str): The processed word
+            actual_word (str): The actual word
+
+        Returns:
+            Optional[float]: The frequency of the word, or None if the word is not indexed
+        """
+
+        trie_node = self
+        for letter in processed_word:
+            trie_node = trie_node.children.get(letter)
+            if trie_node is None:
+                return None
+
+        if (
+            trie_node.words_at_node is None
+            or actual_word not in trie_node.words_at_node
+        ):
+            return None
+        return trie_node.frequencies_at_node[trie_node.words_at_node.index(actual_word)]
+
+    def get_words(self, processed_word: str) -> List[Tuple[str, float]]:
+        """Get the words indexed with a processed word, following its letters from the root
+
+        Args:
+            processed_word (str): The processed word
+
+        Returns:
+            List[Tuple[str, float]]: The actual words with their frequencies, in the order they were indexed
+        """
+
+        trie_node = self
+        for letter in processed_word:
+            trie_node = trie_node.children.get(letter)
+            if trie_node is None:
+                return []
+
+        if trie_node.words_at_node is None:
+            return []
+        return list(zip(trie_node.words_at_node, trie_node.frequencies_at_node))
+
+    def has_word(self, processed_word: str, actual_word: str) -> bool:
+        """Check whether a word is indexed in the Trie dictionary
+
+        Args:
+            processed_word (str): The processed word
+            actual_word (str): The actual word
+
+        Returns:
+            bool: Whether the word is indexed
+        """
+
+        return self.get_frequency(processed_word, actual_word) is not None
+
+
+class CompactTrie(object):
+    """Immutable Trie stored in flat arrays, with the nodes laid out in breadth-first order.
+
+    Node `0` is the root. The children of node `i` are the contiguous nodes
+    `child_start[i]` to `child_start[i + 1] - 1`, and `labels[j]` is the code point of
+    the letter on the edge leading to node `j`. The words at node `i` are the word ids
+    `word_start[i]` to `word_start[i + 1] - 1`, stored UTF-8 encoded in `word_data`
+    and delimited by `word_offsets`. `word_frequencies` has the frequency of every word
+    and `max_frequencies` the largest frequency of the words below every node, while
+    `min_lengths` and `max_lengths` have the fewest and the most letters between every
+    node and the ends of the words below it
+    """
+
+    def __init__(
+        self,
+        labels: array,
+        child_start: array,
+        word_start: array,
+        word_offsets: array,
+        word_data: bytes,
+        word_frequencies: array,
+        max_frequencies: array,
+        min_lengths: array,
+        max_lengths: array,
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            labels (array): The edge letter (code point) of every node
+            child_start (array): The index of the first child of every node, plus a sentinel
+            word_start (array): The id of the first word of every node, plus a sentinel
+            word_offsets (array): The byte offsets of every word in `word_data`, plus a sentinel
+            word_data (bytes): The UTF-8 encoded words, concatenated
+            word_frequencies (array): The frequency of every word
+            max_frequencies (array): The largest frequency of the words below every node, including its own words
+            min_lengths (array): The fewest letters between every node and the ends of the words below it
+            max_lengths (array): The most letters between every node and the ends of the words below it
+        """
+
+        self.labels = labels
+        self.child_start = child_start
+        self.word_start = word_start
+        self.word_offsets = word_offsets
+        self.word_data = word_data
+        self.word_frequencies = word_frequencies
+        self.max_frequencies = max_frequencies
+        self.min_lengths = min_lengths
+        self.max_lengths = max_lengths
+
+    @classmethod
+    def build(cls, words: List[Tuple[str, str, Optional[float]]]) -> "CompactTrie":
+        """Build the arrays from a list of words. The children of every node keep the
+        order in which their letters are first seen and duplicate words are skipped,
+        same as in `Dictionary`
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies to index
+
+        Returns:
+            CompactTrie: The built Trie
+        """
+
+        labels = array("I", [0])
+        child_start = array("I")
+        word_start = array("I")
+        word_offsets = array("I", [0])
+        word_data = bytearray()
+        word_frequencies = array("d")
+
+        num_nodes = 1
+        queue = deque([list(range(len(words)))])
+        depth = 0
+        level_remaining = 1
+        next_level = 0
+        while queue:
+            entries = queue.popleft()
+
+            child_start.append(num_nodes)
+            word_start.append(len(word_offsets) - 1)
+
+            groups = {}
+            actual_words = []
+            first_word = len(word_frequencies)
+            for entry in entries:
+                processed_word, actual_word, frequency = words[entry]
+                if len(processed_word) == depth:
+                    if actual_word not in actual_words:
+                        actual_words.append(actual_word)
+                        word_data.extend(actual_word.encode("utf-8"))
+                        word_offsets.append(len(word_data))
+                        word_frequencies.append(frequency or 0)
+                    elif frequency is not None:
+                        index = first_word + actual_words.index(actual_word)
+                        word_frequencies[index] = frequency
+                else:
+                    letter = processed_word[depth]
+                    if letter in groups:
+                        groups[letter].append(entry)
+                    else:
+                        groups[letter] = [entry]
+
+            for letter, child_entries in groups.items():
+                labels.append(ord(letter))
+                queue.append(child_entries)
+            num_nodes += len(groups)
+            next_level += len(groups)
+
+            level_remaining -= 1
+            if level_remaining == 0:
+                depth += 1
+                level_remaining = next_level
+                next_level = 0
+
+        child_start.append(num_nodes)
+        word_start.append(len(word_offsets) - 1)
+
+        # The children come after their parent in breadth-first order
+        max_frequencies = array("d", bytes(8 * num_nodes))
+        for node in range(num_nodes - 1, -1, -1):
+            max_frequency = 0
+            for i in range(word_start[node], word_start[node + 1]):
+                if word_frequencies[i] > max_frequency:
+                    max_frequency = word_frequencies[i]
+            for child in range(child_start[node], child_start[node + 1]):
+                if max_frequencies[child] > max_frequency:
+                    max_frequency = max_frequencies[child]
+            max_frequencies[node] = max_frequency
+
+        return cls(
+            labels,
+            child_start,
+            word_start,
+            word_offsets,
+            bytes(word_data),
+            word_frequencies,
+            max_frequencies,
+            *_get_length_bounds(child_start, word_start),
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        """The number of nodes in the Trie, including the root"""
+
+        return len(self.labels)
+
+    @property
+    def num_words(self) -> int:
+        """The number of words indexed in the Trie"""
+
+        return len(self.word_offsets) - 1
+
+    def children_of(self, node: int) -> dict:
+        """The children of the node, as a mapping from letter to node index
+
+        Args:
+            node (int): The index of the node
+
+        Returns:
+            dict: The letters and the indices of the child nodes
+        """
+
+        labels = self.labels
+        return {
+            chr(labels[child]): child
+            for child in range(self.child_start[node], self.child_start[node + 1])
+        }
+
+    def words_of(self, node: int) -> Optional[List[str]]:
+        """The words indexed at the node
+
+        Args:
+            node (int): The index of the node
+
+        Returns:
+            Optional[List[str]]: The words at the node, or None if there are no words
+        """
+
+        first_word = self.word_start[node]
+        last_word = self.word_start[node + 1]
+        if first_word == last_word:
+            return None
+
+        word_offsets = self.word_offsets
+        word_data = self.word_data
+        return [
+            bytes(word_data[word_offsets[i] : word_offsets[i + 1]]).decode("utf-8")
+            for i in range(first_word, last_word)
+        ]
+
+    def find(self, processed_word: str) -> Optional[int]:
+        """Find the node of a processed word by following its letters from the root
+
+        Args:
+            processed_word (str): The processed word
+
+        Returns:
+            Optional[int]: The index of the node, or None if the Trie has no such node
+        """
+
+        labels = self.labels
+        child_start = self.child_start
+        node = 0
+        for letter in processed_word:
+            code_point = ord(letter)
+            for child in range(child_start[node], child_start[node + 1]):
+                if labels[child] == code_point:
+                    node = child
+                    break
+            else:
+                return None
+        return node
+
+    def frequencies_of(self, node: int) -> Optional[List[float]]:
+        """The frequencies of the words indexed at the node
+
+        Args:
+            node (int): The index of the node
+
+        Returns:
+            Optional[List[float]]: The frequencies of the words at the node, or None if there are no words
+        """
+
+        first_word = self.word_start[node]
+        last_word = self.word_start[node + 1]
+        if first_word == last_word:
+            return None
+        return list(self.word_frequencies[first_word:last_word])
+
+    def iter_words(self) -> Iterator[Tuple[str, str, float]]:
+        """Iterate over the indexed words in depth-first order of the Trie
+
+        Yields:
+            Tuple[str, str, float]: The processed word (key), the actual word and its frequency
+        """
+
+        stack = [("", 0)]
+        while stack:
+            prefix, node = stack.pop()
+            actual_words = self.words_of(node)
+            if actual_words is not None:
+                for actual_word, frequency in zip(
+                    actual_words, self.frequencies_of(node)
+                ):
+                    yield prefix, actual_word, frequency
+            for child in range(
+                self.child_start[node + 1] - 1, self.child_start[node] - 1, -1
+            ):
+                stack.append((prefix + chr(self.labels[child]), child))
+
+
+class CompactNode(object):
+    """A lightweight view of a node in a `CompactTrie`, exposing the same `children`,
+    `words_at_node`, `frequencies_at_node`, `max_frequency`, `min_length` and
+    `max_length` attributes as a `Dictionary` node so that the algorithms can search it.
+    The views are made on the fly and nothing is cached, so the memory stays that of
+    the arrays however many nodes are searched
+    """
+
+    __slots__ = ("_trie", "_node")
+
+    def __init__(self, trie: CompactTrie, node: int) -> None:
+        """The constructor for the class
+
+        Args:
+            trie (CompactTrie): The Trie the node belongs to
+            node (int): The index of the node
+        """
+
+        self._trie = trie
+        self._node = node
+
+    @property
+    def children(self) -> dict:
+        """The children of the node, as a mapping from letter to `CompactNode`"""
+
+        trie = self._trie
+        labels = trie.labels
+        return {
+            chr(labels[child]): CompactNode(trie, child)
+            for child in range(
+                trie.child_start[self._node], trie.child_start[self._node + 1]
+            )
+        }
+
+    @property
+    def words_at_node(self) -> Optional[List[str]]:
+        """The words indexed at the node, or None if there are no words"""
+
+        return self._trie.words_of(self._node)
+
+    @property
+    def frequencies_at_node(self) -> Optional[List[float]]:
+        """The frequencies of the words indexed at the node, or None if there are no words"""
+
+        return self._trie.frequencies_of(self._node)
+
+    @property
+    def max_frequency(self) -> float:
+        """The largest frequency of the words below the node"""
+
+        return self._trie.max_frequencies[self._node]
+
+    @property
+    def min_length(self) -> int:
+        """The fewest letters between the node and the ends of the words below it"""
+
+        return self._trie.min_lengths[self._node]
+
+    @property
+    def max_length(self) -> int:
+        """The most letters between the node and the ends of the words below it"""
+
+        return self._trie.max_lengths[self._node]
+
+
+def _get_length_bounds(child_start: array, word_start: array) -> Tuple[array, array]:
+    """Compute the fewest and the most letters between every node of a `CompactTrie`
+        and the ends of the words below it, 0 for a Trie without words
+
+    Args:
+        child_start (array): The index of the first child of every node, plus a sentinel
+        word_start (array): The id of the first word of every node, plus a sentinel
+
+    Returns:
+        Tuple[array, array]: The fewest and the most letters of every node
+    """
+
+    num_nodes = len(child_start) - 1
+    min_lengths = array("I", bytes(4 * num_nodes))
+    max_lengths = array("I", bytes(4 * num_nodes))
+
+    # The children come after their parent in breadth-first order
+    for node in range(num_nodes - 1, -1, -1):
+        first_child = child_start[node]
+        last_child = child_start[node + 1]
+        if word_start[node] < word_start[node + 1] or first_child == last_child:
+            min_length = 0
+        else:
+            min_length = min(min_lengths[first_child:last_child]) + 1
+        if first_child < last_child:
+            max_lengths[node] = max(max_lengths[first_child:last_child]) + 1
+        min_lengths[node] = min_length
+
+    return min_lengths, max_lengths
+
+
+def _align(offset: int) -> int:
+    """Round the offset up to the next multiple of 8 bytes
+
+    Args:
+        offset (int): The offset in bytes
+
+    Returns:
+        int: The aligned offset
+    """
+
+    return (offset + 7) & ~7
+
+
+class CompactDictionary(object):
+    """Memory efficient Trie based dictionary backed by a `CompactTrie`.
+
+    It is a drop-in replacement for `Dictionary` which stores the whole Trie in a few flat
+    arrays instead of one Python object per node. Words added with `add_words(...)` or
+    removed with `remove_words(...)` are buffered and the arrays are (re)built lazily on
+    the next search. The arrays are never modified, so the copies returned by
+    `with_words(...)` and `without_words(...)` share them.
+
+    A rebuild costs as much as building the whole Trie again, whatever the number of
+    words changed, so the changes are best made in large batches (or the index rebuilt
+    and saved offline, and loaded with `load(...)`) rather than one word at a time
+    between searches
+    """
+
+    def __init__(self, trie: Optional[CompactTrie] = None) -> None:
+        """The constructor for the class
+
+        Args:
+            trie (Optional[CompactTrie], optional): An already built Trie to serve. Defaults to None
+        """
+
+        self._trie = CompactTrie.build([]) if trie is None else trie
+        self._root = None
+        self._pending = list()
+        self._lock = threading.Lock()
+
+    def add_words(self, words: List[Tuple[str, str, Optional[float]]]) -> None:
+        """Add words to index to the Trie dictionary
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies (None to keep the frequency, 0 for new words) to index to the dictionary
+        """
+
+        words = list(words)
+        with self._lock:
+            self._pending.append((True, words))
+
+    def remove_words(self, words: List[Tuple[str, str]]) -> None:
+        """Remove indexed words from the Trie dictionary. Words which are not indexed are skipped
+
+        Args:
+            words (List[Tuple[str, str]]): The processed and actual words to remove from the dictionary
+        """
+
+        words = list(words)
+        with self._lock:
+            self._pending.append((False, words))
+
+    def with_words(
+        self,
+        words: List[Tuple[str, str, Optional[float]]],
+        owner: Optional[object] = None,
+    ) -> "CompactDictionary":
+        """Copy-on-write version of `add_words(...)`
+
+        Args:
+            words (List[Tuple[str, str, Optional[float]]]): The processed words, actual words and frequencies to index to the dictionary
+            owner (Optional[object], optional): Unused, the words are always buffered. Defaults to None
+
+        Returns:
+            CompactDictionary: The new dictionary
+        """
+
+        with self._lock:
+            dictionary = CompactDictionary(self._trie)
+            dictionary._pending = self._pending + [(True, list(words))]
+        return dictionary
+
+    def without_words(
+        self, words: List[Tuple[str, str]], owner: Optional[object] = None
+    ) -> "CompactDictionary":
+        """Copy-on-write version of `remove_words(...)`
+
+        Args:
+            words (List[Tuple[str, str]]): The processed and actual words to remove from the dictionary
+            owner (Optional[object], optional): Unused, the words are always buffered. Defaults to None
+
+        Returns:
+            CompactDictionary: The new dictionary
+        """
+
+        with self._lock:
+            dictionary = CompactDictionary(self._trie)
+            dictionary._pending = self._pending + [(False, list(words))]
+        return dictionary
+
+    def get_frequency(self, processed_word: str, actual_word: str) -> Optional[float]:
+        """Get the frequency of an indexed word
+
+        Args:
+            processed_word (str): The processed word
+            actual_word (str): The actual word
+
+        Returns:
+            Optional[float]: The frequency of the word, or None if the word is not indexed
+        """
+
+        trie = self.trie
+        node = trie.find(processed_word)
+        if node is None:
+            return None
+
+        actual_words = trie.words_of(node)
+        if actual_words is None or actual_word not in actual_words:
+            return None
+        return trie.frequencies_of(node)[actual_words.index(actual_word)]
+
+    def get_words(self, processed_word: str) -> List[Tuple[str, float]]:
+        """Get the words indexed with a processed word, following its letters from the root
+
+        Args:
+            processed_word (str): The processed word
+
+        Returns:
+            List[Tuple[str, float]]: The actual words with their frequencies, in the order they were indexed
+        """
+
+        trie = self.trie
+        node = trie.find(processed_word)
+        if node is None:
+            return []
+
+        actual_words = trie.words_of(node)
+        if actual_words is None:
+            return []
+        return list(zip(actual_words, trie.frequencies_of(node)))
+
+    def has_word(self, processed_word: str, actual_word: str) -> bool:
+        """Check whether a word is indexed in the Trie dictionary
+
+        Args:
+            processed_word (str): The processed word
+            actual_word (str): The actual word
+
+        Returns:
+            bool: Whether the word is indexed
+        """
+
+        return self.get_frequency(processed_word, actual_word) is not None
+
+    def _get_root(self) -> CompactNode:
+        """Get the root node of the Trie, building the arrays if there are pending words.
+            Concurrent searches wait for a single build
+
+        Returns:
+            CompactNode: The root node of the Trie
+        """
+
+        if self._pending:
+            with self._lock:
+                if self._pending:
+                    words = list(self._trie.iter_words())
+                    for added, entries in self._pending:
+                        if added:
+                            words.extend(entries)
+                        else:
+                            removed = set(entries)
+                            words = [
+                                entry for entry in words if entry[:2] not in removed
+                            ]
+                    self._trie = CompactTrie.build(words)
+                    self._root = CompactNode(self._trie, 0)
+                    self._pending = list()
+
+        root = self._root
+        if root is None:
+            root = self._root = CompactNode(self._trie, 0)
+        return root
+
+    @property
+    def trie(self) -> CompactTrie:
+        """The underlying array based Trie"""
+
+        self._get_root()
+        return self._trie
+
+    @property
+    def children(self) -> dict:
+        """The children of the root node, as a mapping from letter to `CompactNode`"""
+
+        return self._get_root().children
+
+    @property
+    def words_at_node(self) -> Optional[List[str]]:
+        """The words indexed at the root node, or None if there are no words"""
+
+        return self._get_root().words_at_node
+
+    @property
+    def frequencies_at_node(self) -> Optional[List[float]]:
+        """The frequencies of the words indexed at the root node, or None if there are no words"""
+
+        return self._get_root().frequencies_at_node
+
+    @property
+    def max_frequency(self) -> float:
+        """The largest frequency of the indexed words"""
+
+        return self._get_root().max_frequency
+
+    @property
+    def min_length(self) -> int:
+        """The length of the shortest indexed word"""
+
+        return self._get_root().min_length
+
+    @property
+    def max_length(self) -> int:
+        """The length of the longest indexed word"""
+
+        return self._get_root().max_length
+
+    def iter_words(self) -> Iterator[Tuple[str, str, float]]:
+        """Iterate over the indexed words in depth-first order of the Trie
+
+        Yields:
+            Tuple[str, str, float]: The processed word (key), the actual word and its frequency
+        """
+
+        return self.trie.iter_words()
+
+    def save(self, path: str, algorithm: str) -> None:
+        """Save the Trie to a binary file which can be memory-mapped by `load(...)`
+
+        Args:
+            path (str): The path to the file
+            algorithm (str): The name of the algorithm whose pre-processor produced the keys
+        """
+
+        trie = self.trie
+        name = algorithm.encode("utf-8")
+        sections = [
+            trie.labels,
+            trie.child_start,
+            trie.word_start,
+            trie.word_offsets,
+            trie.word_data,
+            trie.word_frequencies,
+            trie.max_frequencies,
+            trie.min_lengths,
+            trie.max_lengths,
+        ]
+        if sys.byteorder != "little":
+            for i, typecode in enumerate(_INDEX_TYPECODES):
+                if typecode is not None:
+                    sections[i] = array(typecode, sections[i])
+                    sections[i].byteswap()
+
+        with open(path, "wb") as fd:
+            header = _INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, len(name))
+            offset = len(header) + len(name)
+            fd.write(header + name + b"\0" * (_align(offset) - offset))
+            fd.write(
+                _INDEX_SECTIONS[INDEX_FORMAT_VERSION].pack(
+                    *[memoryview(s).nbytes for s in sections]
+                )
+            )
+            for section in sections:
+                section = memoryview(section)
+                fd.write(section)
+                fd.write(b"\0" * (_align(section.nbytes) - section.nbytes))
+
+    @classmethod
+    def load(
+        cls, path: str, algorithm: Optional[str] = None, mmap: bool = True
+    ) -> "CompactDictionary":
+        """Load a Trie saved with `save(...)`. When memory-mapped, the arrays are served
+        straight from the file without copying, so the pages are shared between processes
+
+        Args:
+            path (str): The path to the file
+            algorithm (Optional[str], optional): The name of the algorithm expected to have produced the keys. Defaults to None
+            mmap (bool, optional): Whether to memory-map the file instead of reading it. Defaults to True
+
+        Raises:
+            ValueError: If the file is not a valid index or was built by another algorithm
+
+        Returns:
+            CompactDictionary: The dictionary serving the saved Trie
+        """
+
+        with open(path, "rb") as fd:
+            if mmap:
+                buffer = memory_map(fd.fileno(), 0, access=ACCESS_READ)
+            else:
+                buffer = fd.read()
+        view = memoryview(buffer)
+
+        if len(view) < _INDEX_HEADER.size:
+            raise ValueError("'{}' is not a spellwise index".format(path))
+        magic, version, name_length = _INDEX_HEADER.unpack_from(view, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError("'{}' is not a spellwise index".format(path))
+        if version not in _INDEX_SECTIONS:
+            raise ValueError(
+                "'{}' has index format version {}, expected {}".format(
+                    path, version, INDEX_FORMAT_VERSION
+                )
+            )
+
+        offset = _INDEX_HEADER.size
+        if offset + name_length > len(view):
+            raise ValueError("'{}' is truncated".format(path))
+        name = bytes(view[offset : offset + name_length]).decode("utf-8")
+        if algorithm is not None and name != algorithm:
+            raise ValueError(
+                "'{}' was built for {}, not for {}".format(path, name, algorithm)
+            )
+
+        offset = _align(offset + name_length)
+        if offset + _INDEX_SECTIONS[version].size > len(view):
+            raise ValueError("'{}' is truncated".format(path))
+        lengths = _INDEX_SECTIONS[version].unpack_from(view, offset)
+        offset += _INDEX_SECTIONS[version].size
+
+        sections = list()
+        for length in lengths:
+            sections.append(view[offset : offset + length])
+            offset = _align(offset + length)
+        if offset > len(view):
+            raise ValueError("'{}' is truncated".format(path))
+
+        if version == 1:
+            num_words = sections[3].nbytes // 4 - 1
+            num_nodes = sections[0].nbytes // 4
+            sections.append(memoryview(bytes(8 * num_words)))
+            sections.append(memoryview(bytes(8 * num_nodes)))
+
+        for i, typecode in enumerate(_INDEX_TYPECODES[: len(sections)]):
+            if typecode is not None:
+                sections[i] = sections[i].cast(typecode)
+                if sys.byteorder != "little":
+                    sections[i] = array(typecode, sections[i])
+                    sections[i].byteswap()
+
+        if version < 3:
+            sections.extend(_get_length_bounds(sections[1], sections[2]))
+
+        return cls(CompactTrie(*sections))
@@ -0,0 +1,93 @@
+import math
+from hashlib import blake2b
+
+
+class BloomFilter(object):
+    """Compact probabilistic set of strings. A string which was added is always found,
+    while a string which was not is found with a probability of about the false
+    positive rate, as long as no more strings than the capacity are added. Every
+    string takes about 1.2 bytes for a false positive rate of 1%
+
+    Reference: https://en.wikipedia.org/wiki/Bloom_filter
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01) -> None:
+        """The constructor for the class
+
+        Args:
+            capacity (int): The number of strings the filter is sized for
+            false_positive_rate (float, optional): The probability to find a string which was not added, between 0 and 1. Defaults to 0.01
+
+        Raises:
+            ValueError: If the false positive rate is not between 0 and 1
+        """
+
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        self.capacity = max(1, capacity)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(
+            64,
+            int(
+                math.ceil(
+                    -self.capacity * math.log(false_positive_rate) / math.log(2) ** 2
+                )
+            ),
+        )
+        self.num_hashes = max(
+            1, int(round(self.num_bits / self.capacity * math.log(2)))
+        )
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _get_positions(self, key: str) -> range:
+        """The positions of the bits of a string, by double hashing a 64 bits hash. The
+            hash does not depend on the process, unlike `hash(...)`, so that the filter can
+            be shared with other processes
+
+        Args:
+            key (str): The string
+
+        Returns:
+            range: The positions of the bits, before taking them modulo the number of bits
+        """
+
+        key_hash = int.from_bytes(
+            blake2b(key.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        step = (key_hash >> 32) | 1
+        start = key_hash & 0xFFFFFFFF
+        return range(start, start + step * self.num_hashes, step)
+
+    def add(self, key: str) -> None:
+        """Add a string to the filter
+
+        Args:
+            key (str): The string
+        """
+
+        bits = self._bits
+        num_bits = self.num_bits
+        for position in self._get_positions(key):
+            position %= num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        num_bits = self.num_bits
+        for position in self._get_positions(key):
+            position %= num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def memory(self) -> int:
+        """The size of the bit array (bytes)"""
+
+        return len(self._bits)
@@ -0,0 +1,6 @@
+# flake8: noqa
+
+__all__ = ["ServerMetrics", "ShardedIndex", "SpellServer"]
+
+from .server import ServerMetrics, SpellServer
+from .sharded import ShardedIndex
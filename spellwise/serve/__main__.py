@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from ..algorithms import ALGORITHMS
+from .server import SpellServer
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Index a local lexicon (or load a saved index) and serve its suggestions over HTTP"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m spellwise.serve",
+        description="Serve the suggestions of a spellwise algorithm over a local HTTP/JSON API",
+    )
+    parser.add_argument(
+        "--algorithm",
+        default="Levenshtein",
+        choices=sorted(ALGORITHMS),
+        help="algorithm to serve (default: %(default)s)",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--lexicon",
+        help="word list to index, one word (and optionally a tab and its frequency) per line",
+    )
+    source.add_argument("--index", help="index file written by the algorithm's save()")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="index the words in the array based CompactDictionary",
+    )
+    parser.add_argument(
+        "--engine",
+        help="engine of the Trie search, e.g. numpy, or bitparallel for Levenshtein",
+    )
+    parser.add_argument(
+        "--cache",
+        type=int,
+        default=0,
+        help="number of recent queries to cache, 0 to disable (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="host to listen on (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="number of worker threads or processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="search in forked worker processes instead of threads",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="maximum number of queries per batch (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-delay",
+        type=float,
+        default=1.0,
+        help="milliseconds to wait for more queries to join a batch (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=float,
+        help="maximum distance of the queries which do not give one (default: the algorithm's)",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="maximum number of suggestions per query"
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        help="seconds between the metrics printed to stderr (default: never)",
+    )
+    arguments = parser.parse_args(args)
+
+    options = dict()
+    if arguments.compact:
+        options["compact"] = True
+    if arguments.engine:
+        if arguments.engine not in ALGORITHMS[arguments.algorithm].ENGINES:
+            parser.error(
+                "unknown engine '{}' for {}".format(
+                    arguments.engine, arguments.algorithm
+                )
+            )
+        options["engine"] = arguments.engine
+    algorithm = ALGORITHMS[arguments.algorithm](**options)
+    if arguments.lexicon:
+        algorithm.add_from_path(arguments.lexicon)
+    else:
+        algorithm.load(arguments.index)
+    if arguments.cache > 0:
+        algorithm.enable_cache(arguments.cache)
+
+    max_distance = arguments.max_distance
+    if max_distance is not None and max_distance.is_integer():
+        max_distance = int(max_distance)
+
+    server = SpellServer(
+        algorithm,
+        host=arguments.host,
+        port=arguments.port,
+        workers=arguments.workers,
+        processes=arguments.processes,
+        batch_size=arguments.batch_size,
+        batch_delay=arguments.batch_delay / 1000,
+        max_distance=max_distance,
+        limit=arguments.limit,
+    )
+
+    async def serve() -> None:
+        await server.start()
+        sys.stderr.write(
+            "Serving {} on http://{}:{}\n".format(
+                arguments.algorithm, server.host, server.port
+            )
+        )
+        await server.serve_forever(report_interval=arguments.report_interval)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
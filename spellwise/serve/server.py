@@ -0,0 +1,525 @@
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..algorithms.base import Base, _run_in_batch_worker
+from ..utils import get_percentile
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+def _search(
+    algorithm: Base, queries: List[Tuple[str, Optional[float], Optional[int]]]
+) -> List[Tuple[bool, Any]]:
+    """Get the suggestions of a batch of queries
+
+    Args:
+        algorithm (Base): The algorithm
+        queries (List[Tuple[str, Optional[float], Optional[int]]]): The query word, maximum distance (None for the default of the algorithm) and limit of every query
+
+    Returns:
+        List[Tuple[bool, Any]]: For every query, whether it succeeded and either its suggestions or the error message
+    """
+
+    results = list()
+    for query_word, max_distance, limit in queries:
+        try:
+            if max_distance is None:
+                suggestions = algorithm.get_suggestions(query_word, limit=limit)
+            else:
+                suggestions = algorithm.get_suggestions(query_word, max_distance, limit)
+            results.append((True, suggestions))
+        except Exception as error:
+            results.append((False, "{}: {}".format(type(error).__name__, error)))
+    return results
+
+
+def _parse_number(value: Any, name: str, integer: bool = False) -> Optional[float]:
+    """Parse an optional numeric parameter of a request, which must be finite and not
+    negative
+
+    Args:
+        value (Any): The value of the parameter, None when it is missing
+        name (str): The name of the parameter
+        integer (bool, optional): Whether the number must be an integer. Defaults to False
+
+    Raises:
+        ValueError: If the value is not a finite number, not an integer when one is needed, or is negative
+
+    Returns:
+        Optional[float]: The number, an int when it is integral
+    """
+
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("'{}' must be a number".format(name))
+    if not math.isfinite(number) or number < 0:
+        raise ValueError("'{}' must be a finite number, at least 0".format(name))
+    if number.is_integer():
+        return int(number)
+    if integer:
+        raise ValueError("'{}' must be an integer".format(name))
+    return number
+
+
+class ServerMetrics(object):
+    """Counters and latencies of the queries served by a `SpellServer`"""
+
+    def __init__(self, window: int = 10000) -> None:
+        """The constructor for the class
+
+        Args:
+            window (int, optional): The number of most recent queries whose latencies are kept for the percentiles. Defaults to 10000
+        """
+
+        self.start_time = time.perf_counter()
+        self.requests = 0
+        self.queries = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+
+    def record_query(self, latency: float) -> None:
+        """Record a query which was answered
+
+        Args:
+            latency (float): The time from the arrival of the query to its answer (seconds)
+        """
+
+        self.queries += 1
+        self._latencies.append(latency)
+
+    def record_batch(self, size: int) -> None:
+        """Record a batch of queries dispatched to the workers
+
+        Args:
+            size (int): The number of queries of the batch
+        """
+
+        self.batches += 1
+        self.batched_queries += size
+
+    def snapshot(self) -> dict:
+        """Get the current metrics
+
+        Returns:
+            dict: The uptime (seconds), the numbers of requests, queries, coalesced queries, batches and errors, the mean batch size, the throughput (queries per second) and the latency percentiles (seconds) of the recent queries
+        """
+
+        uptime = time.perf_counter() - self.start_time
+        latencies = sorted(self._latencies)
+        return {
+            "uptime": uptime,
+            "requests": self.requests,
+            "queries": self.queries,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "mean_batch_size": (
+                self.batched_queries / self.batches if self.batches else 0.0
+            ),
+            "errors": self.errors,
+            "queries_per_second": self.queries / uptime if uptime > 0 else 0.0,
+            "p50_latency": get_percentile(latencies, 50),
+            "p90_latency": get_percentile(latencies, 90),
+            "p99_latency": get_percentile(latencies, 99),
+        }
+
+
+class SpellServer(object):
+    """Lightweight HTTP/JSON server for the suggestions of an already loaded algorithm.
+
+    The queries are answered by an asyncio event loop which never searches the Trie
+    itself. Identical queries in flight share one search, and the other queries are
+    grouped into small batches which are searched by a pool of worker threads or
+    processes. The endpoints are:
+
+    - `GET /suggest?word=...&max_distance=...&limit=...`: the suggestions of a word
+    - `POST /suggest` with `{"words": [...], "max_distance": ..., "limit": ...}`: the suggestions of several words
+    - `GET /metrics`: the throughput and latency metrics, see `ServerMetrics`
+    - `GET /health`: the status and the version of the indexed words
+    """
+
+    MAX_BODY_SIZE = 1 << 20
+
+    def __init__(
+        self,
+        algorithm: Base,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 4,
+        processes: bool = False,
+        batch_size: int = 32,
+        batch_delay: float = 0.001,
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> None:
+        """The constructor for the class
+
+        Args:
+            algorithm (Base): The algorithm, with its words already indexed
+            host (str, optional): The host to listen on. Defaults to "127.0.0.1"
+            port (int, optional): The port to listen on, 0 for any free port. Defaults to 8000
+            workers (int, optional): The number of workers, which is also the maximum number of batches searched at the same time. Defaults to 4
+            processes (bool, optional): Whether the workers are processes forked at startup, which search in parallel but keep serving the words indexed at that time, instead of threads. Defaults to False
+            batch_size (int, optional): The maximum number of queries of a batch. Defaults to 32
+            batch_delay (float, optional): How long to wait for more queries to join a batch (seconds). Defaults to 0.001
+            max_distance (Optional[float], optional): The maximum distance of the queries which do not give one. Defaults to None, the default of the algorithm
+            limit (Optional[int], optional): The limit of the queries which do not give one. Defaults to None, all the suggestions
+        """
+
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.algorithm = algorithm
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.processes = processes
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_distance = max_distance
+        self.limit = limit
+        self.metrics = ServerMetrics()
+
+        self._executor = None
+        self._server = None
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._in_flight = dict()
+
+    def _create_executor(self) -> Executor:
+        """Create the pool of workers. The processes are forked right away, like the
+            workers of `get_suggestions_batch(...)`, so that they inherit the indexed words
+
+        Returns:
+            Executor: The pool of workers
+        """
+
+        if not self.processes:
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return self.algorithm._create_batch_executor(self.workers)
+
+    async def start(self) -> None:
+        """Start the workers and listen for connections. The port actually bound is set
+        to `port`
+        """
+
+        self._executor = self._create_executor()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening for connections and shut the workers down"""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def serve_forever(self, report_interval: Optional[float] = None) -> None:
+        """Serve until cancelled, starting the server unless it is started already
+
+        Args:
+            report_interval (Optional[float], optional): How often to print the metrics to stderr (seconds). Defaults to None, never
+        """
+
+        if self._server is None:
+            await self.start()
+        try:
+            while True:
+                if report_interval is None:
+                    await asyncio.sleep(3600)
+                    continue
+
+                queries = self.metrics.queries
+                await asyncio.sleep(report_interval)
+                metrics = self.metrics.snapshot()
+                print(
+                    "queries={queries} qps={qps:.1f} p50={p50:.3f}ms p99={p99:.3f}ms "
+                    "batch={mean_batch_size:.1f} coalesced={coalesced} "
+                    "errors={errors}".format(
+                        qps=(metrics["queries"] - queries) / report_interval,
+                        p50=metrics["p50_latency"] * 1000,
+                        p99=metrics["p99_latency"] * 1000,
+                        **metrics,
+                    ),
+                    file=sys.stderr,
+                    flush=True,
+                )
+        finally:
+            await self.stop()
+
+    async def suggest(
+        self,
+        query_word: str,
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Get the suggestions of a word through the batches of the server
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the query word. Defaults to None, the default of the server
+            limit (Optional[int], optional): The maximum number of suggestions to return. Defaults to None, the default of the server
+
+        Raises:
+            ValueError: If the search failed
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        start_time = time.perf_counter()
+        if max_distance is None:
+            max_distance = self.max_distance
+        if limit is None:
+            limit = self.limit
+
+        key = (query_word, max_distance, limit)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            self._queue.put_nowait((key, future))
+        else:
+            self.metrics.coalesced += 1
+
+        succeeded, result = await asyncio.shield(future)
+        self.metrics.record_query(time.perf_counter() - start_time)
+        if not succeeded:
+            self.metrics.errors += 1
+            raise ValueError(result)
+        # Coalesced queries share the result, so every caller gets its own dicts
+        return [dict(suggestion) for suggestion in result]
+
+    async def _batch_loop(self) -> None:
+        """Group the queued queries into batches and hand them to the workers, while
+        fewer than `workers` batches are being searched. The queries queued while
+        all the workers are busy make up larger batches
+        """
+
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_delay > 0 and self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._slots.acquire()
+            self.metrics.record_batch(len(batch))
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[tuple, asyncio.Future]]) -> None:
+        """Search a batch of queries in a worker and resolve their futures
+
+        Args:
+            batch (List[Tuple[tuple, asyncio.Future]]): The key and the future of every query
+        """
+
+        loop = asyncio.get_running_loop()
+        queries = [key for key, _ in batch]
+        try:
+            if self.processes:
+                results = await loop.run_in_executor(
+                    self._executor, _run_in_batch_worker, _search, queries
+                )
+            else:
+                results = await loop.run_in_executor(
+                    self._executor, _search, self.algorithm, queries
+                )
+        except Exception as error:
+            message = "{}: {}".format(type(error).__name__, error)
+            results = [(False, message)] * len(batch)
+        finally:
+            self._slots.release()
+
+        for (key, future), result in zip(batch, results):
+            del self._in_flight[key]
+            future.set_result(result)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the HTTP requests of a connection, keeping it alive between requests
+            unless the client asks otherwise
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the requests
+            writer (asyncio.StreamWriter): The stream of the responses
+        """
+
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+
+                self.metrics.requests += 1
+                if body is None:
+                    status, payload = 413, {"error": "request body too large"}
+                else:
+                    status, payload = await self._route(method, target, body)
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.0":
+                    keep_alive = connection == "keep-alive"
+                else:
+                    keep_alive = connection != "close"
+                if status == 413:
+                    keep_alive = False
+
+                content = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    "HTTP/1.1 {} {}\r\nContent-Type: application/json\r\n"
+                    "Content-Length: {}\r\nConnection: {}\r\n\r\n".format(
+                        status,
+                        _REASONS[status],
+                        len(content),
+                        "keep-alive" if keep_alive else "close",
+                    ).encode("latin-1")
+                    + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, str, Dict[str, str], Optional[bytes]]]:
+        """Read an HTTP request
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the requests
+
+        Raises:
+            ValueError: If the request is malformed
+
+        Returns:
+            Optional[Tuple[str, str, str, Dict[str, str], Optional[bytes]]]: The method, target, HTTP version, headers (with lowercase names) and body (None if it is too large) of the request, None when the connection is closed
+        """
+
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, target, version = request_line.decode("latin-1").split()
+
+        headers = dict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > self.MAX_BODY_SIZE:
+            return method, target, version, headers, None
+        body = await reader.readexactly(length) if length else b""
+        return method, target, version, headers, body
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        """Answer a request
+
+        Args:
+            method (str): The method of the request
+            target (str): The path and query string of the request
+            body (bytes): The body of the request
+
+        Returns:
+            Tuple[int, Any]: The HTTP status and the JSON payload of the response
+        """
+
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok", "version": self.algorithm.version}
+        if url.path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if url.path != "/suggest":
+            return 404, {"error": "unknown path '{}'".format(url.path)}
+
+        try:
+            if method == "GET":
+                parameters = {
+                    name: values[-1] for name, values in parse_qs(url.query).items()
+                }
+                if not parameters.get("word"):
+                    raise ValueError("'word' is required")
+                words = None
+            elif method == "POST":
+                parameters = json.loads(body.decode("utf-8") or "{}")
+                if not isinstance(parameters, dict):
+                    raise ValueError("the body must be a JSON object")
+                words = parameters.get("words")
+                if words is None and not parameters.get("word"):
+                    raise ValueError("'word' or 'words' is required")
+                if words is not None and not (
+                    isinstance(words, list)
+                    and all(isinstance(word, str) for word in words)
+                ):
+                    raise ValueError("'words' must be a list of strings")
+            else:
+                return 405, {"error": "method '{}' not allowed".format(method)}
+
+            max_distance = _parse_number(parameters.get("max_distance"), "max_distance")
+            limit = _parse_number(parameters.get("limit"), "limit", integer=True)
+
+            if words is None:
+                word = str(parameters["word"])
+                return 200, {
+                    "word": word,
+                    "suggestions": await self.suggest(word, max_distance, limit),
+                }
+
+            suggestions = await asyncio.gather(
+                *[self.suggest(word, max_distance, limit) for word in words]
+            )
+            return 200, {
+                "results": [
+                    {"word": word, "suggestions": word_suggestions}
+                    for word, word_suggestions in zip(words, suggestions)
+                ]
+            }
+        except ValueError as error:
+            return 400, {"error": str(error)}
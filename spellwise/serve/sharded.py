@@ -0,0 +1,429 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from itertools import islice
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
+
+from ..algorithms.base import Base
+from ..utils import read_words
+
+
+def _hash_partition(processed_word: str, shards: int) -> int:
+    """Partition the words by a hash of their pre-processed form, which is the same in
+        every process unlike `hash(...)`
+
+    Args:
+        processed_word (str): The pre-processed word
+        shards (int): The number of shards
+
+    Returns:
+        int: The shard of the word
+    """
+
+    return zlib.crc32(processed_word.encode("utf-8")) % shards
+
+
+def _first_letter_partition(processed_word: str, shards: int) -> int:
+    """Partition the words by the first letter of their pre-processed form
+
+    Args:
+        processed_word (str): The pre-processed word
+        shards (int): The number of shards
+
+    Returns:
+        int: The shard of the word
+    """
+
+    return ord(processed_word[0]) % shards if processed_word else 0
+
+
+_PARTITIONS = {"hash": _hash_partition, "first_letter": _first_letter_partition}
+
+
+def _search_shard(
+    algorithm: Base,
+    query_words: List[str],
+    max_distance: float,
+    limit: Optional[int],
+) -> List[List[Tuple[float, float, str]]]:
+    """Get the suggestions of query words from the words of a shard, with the frequencies
+        needed to merge them with the suggestions of the other shards
+
+    Args:
+        algorithm (Base): The algorithm of the shard
+        query_words (List[str]): The query words
+        max_distance (float): The maximum distance between the words indexed and the query words
+        limit (Optional[int]): The maximum number of suggestions per query word, None for all the suggestions
+
+    Returns:
+        List[List[Tuple[float, float, str]]]: The distance, frequency and word of the suggestions of every query word
+    """
+
+    # The search ranks the suggestions by distance and frequency already, so the
+    # frequencies come with the suggestions instead of being looked up again
+    return [
+        algorithm._search_candidates(
+            algorithm._pre_process(query_word), max_distance, limit
+        )
+        for query_word in query_words
+    ]
+
+
+def _run_shard(
+    algorithm_class: Type[Base],
+    options: dict,
+    authkey: bytes,
+    address_sender: Connection,
+) -> None:
+    """Serve the requests of a `ShardedIndex` for one shard, in its own process, over a
+        local socket (a named pipe on Windows)
+
+    Args:
+        algorithm_class (Type[Base]): The class of the algorithm
+        options (dict): The keyword arguments of the algorithm
+        authkey (bytes): The key authenticating the index to the shard
+        address_sender (Connection): The pipe on which the address of the shard is sent
+    """
+
+    try:
+        algorithm = algorithm_class(**options)
+        listener = Listener(authkey=authkey)
+    except Exception as error:
+        address_sender.send((False, "{}: {}".format(type(error).__name__, error)))
+        return
+    address_sender.send((True, listener.address))
+    address_sender.close()
+
+    handlers = {
+        "add": algorithm.add_words,
+        "remove": algorithm.remove_words,
+        "has": algorithm.has_word,
+        "size": lambda: sum(1 for _ in algorithm._dictionary.iter_words()),
+        "search": lambda *args: _search_shard(algorithm, *args),
+    }
+
+    with listener:
+        connection = listener.accept()
+        with connection:
+            while True:
+                try:
+                    command, *args = connection.recv()
+                except EOFError:
+                    break
+                if command == "close":
+                    connection.send((True, None))
+                    break
+                try:
+                    connection.send((True, handlers[command](*args)))
+                except Exception as error:
+                    connection.send(
+                        (False, "{}: {}".format(type(error).__name__, error))
+                    )
+
+
+class ShardedIndex(object):
+    """The indexed words of an algorithm partitioned into shards, each one indexed and
+    searched by its own process, for lexicons too large for a single process. The
+    shards are reached over local sockets, as they would be on remote nodes.
+
+    The words are partitioned by their pre-processed form, either by a hash (the
+    most even partition) or by their first letter. A query is sent to all the shards
+    holding words, which search it at the same time, and their suggestions are merged
+    by distance and descending frequency. The words at the same distance and with the
+    same frequency may be in a different order than with a single index. The requests
+    to the shards are serialized, so the index can be shared by threads
+    """
+
+    def __init__(
+        self,
+        algorithm: Type[Base],
+        shards: int = 4,
+        partition: Union[str, Callable[[str], int]] = "hash",
+        options: Optional[dict] = None,
+    ) -> None:
+        """The constructor for the class, which starts the processes of the shards
+
+        Args:
+            algorithm (Type[Base]): The class of the algorithm, such as `Levenshtein`
+            shards (int, optional): The number of shards. Defaults to 4
+            partition (Union[str, Callable[[str], int]], optional): How the words are partitioned, either "hash", "first_letter", or a function of the pre-processed word whose value modulo the number of shards is its shard. Defaults to "hash"
+            options (Optional[dict], optional): The keyword arguments of the algorithm of every shard, such as `{"compact": True}`. Defaults to None
+
+        Raises:
+            ValueError: If the number of shards is not positive or the partition is unknown
+            RuntimeError: If a shard fails to start
+        """
+
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        if callable(partition):
+            self._partition = lambda processed_word, shards: (
+                partition(processed_word) % shards
+            )
+        elif partition in _PARTITIONS:
+            self._partition = _PARTITIONS[partition]
+        else:
+            raise ValueError(
+                "partition must be one of {} or a function, got '{}'".format(
+                    ", ".join(sorted(_PARTITIONS)), partition
+                )
+            )
+
+        options = options or dict()
+        self.shards = shards
+
+        # Pre-processes the words for their partition, and never indexes any
+        self._algorithm = algorithm(**options)
+        self._lock = threading.Lock()
+        self._processes = list()
+        self._connections = list()
+
+        # Whether words were added to every shard, as the others are not searched
+        self._filled = [False] * shards
+
+        authkey = os.urandom(16)
+        try:
+            for _ in range(shards):
+                address_receiver, address_sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_run_shard,
+                    args=(algorithm, options, authkey, address_sender),
+                    daemon=True,
+                )
+                process.start()
+                address_sender.close()
+                self._processes.append(process)
+
+                try:
+                    started, address = address_receiver.recv()
+                except EOFError:
+                    started, address = False, "the process exited"
+                address_receiver.close()
+                if not started:
+                    raise RuntimeError("The shard failed to start: {}".format(address))
+                self._connections.append(Client(address, authkey=authkey))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ShardedIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _request(self, requests: List[Tuple[int, tuple]]) -> List[Any]:
+        """Send requests to shards, which handle them at the same time, and gather
+            their results
+
+        Args:
+            requests (List[Tuple[int, tuple]]): The shard and the command with its arguments of every request
+
+        Raises:
+            RuntimeError: If a shard failed to handle its request
+
+        Returns:
+            List[Any]: The result of every request
+        """
+
+        if not self._connections:
+            raise RuntimeError("The index is closed")
+
+        with self._lock:
+            for shard, request in requests:
+                self._connections[shard].send(request)
+
+            # Every reply is received, so that the connections stay in step on errors
+            replies = [self._connections[shard].recv() for shard, _ in requests]
+
+        results = list()
+        for (shard, _), (succeeded, result) in zip(requests, replies):
+            if not succeeded:
+                raise RuntimeError("Shard {} failed: {}".format(shard, result))
+            results.append(result)
+        return results
+
+    def _get_shard(self, processed_word: str) -> int:
+        """Get the shard of a word
+
+        Args:
+            processed_word (str): The pre-processed word
+
+        Returns:
+            int: The shard
+        """
+
+        return self._partition(processed_word, self.shards)
+
+    def add_words(
+        self, words: List[str], frequencies: Optional[List[Optional[float]]] = None
+    ) -> None:
+        """Add words (index) to the shards holding them, see `add_words(...)` of the
+            algorithms
+
+        Args:
+            words (List[str]): The words to be indexed
+            frequencies (Optional[List[Optional[float]]], optional): The frequency of every word. Defaults to None
+        """
+
+        if frequencies is None:
+            frequencies = [None] * len(words)
+
+        batches = [([], []) for _ in range(self.shards)]
+        for processed_word, word, frequency in zip(
+            self._algorithm._pre_process_many(words), words, frequencies
+        ):
+            batch_words, batch_frequencies = batches[self._get_shard(processed_word)]
+            batch_words.append(word)
+            batch_frequencies.append(frequency)
+
+        requests = [
+            (shard, ("add", batch_words, batch_frequencies))
+            for shard, (batch_words, batch_frequencies) in enumerate(batches)
+            if batch_words
+        ]
+        self._request(requests)
+        for shard, _ in requests:
+            self._filled[shard] = True
+
+    def add_from_path(self, path: str, batch_size: int = 10000) -> None:
+        """Add the words of a file to the shards holding them, in batches, see
+            `add_from_path(...)` of the algorithms
+
+        Args:
+            path (str): The path to the file
+            batch_size (int, optional): The number of words added at once. Defaults to 10000
+        """
+
+        words = iter(read_words(path))
+        while True:
+            batch = list(islice(words, batch_size))
+            if not batch:
+                break
+            self.add_words(
+                [word.lower().strip() for word, _ in batch],
+                [frequency for _, frequency in batch],
+            )
+
+    def remove_words(self, words: List[str]) -> None:
+        """Remove indexed words from the shards holding them
+
+        Args:
+            words (List[str]): The words to be removed
+        """
+
+        batches = [[] for _ in range(self.shards)]
+        for processed_word, word in zip(
+            self._algorithm._pre_process_many(words), words
+        ):
+            batches[self._get_shard(processed_word)].append(word)
+
+        self._request(
+            [(shard, ("remove", batch)) for shard, batch in enumerate(batches) if batch]
+        )
+
+    def has_word(self, word: str) -> bool:
+        """Check whether the word is indexed, asking only the shard which would hold it
+
+        Args:
+            word (str): The word
+
+        Returns:
+            bool: Whether the word is indexed
+        """
+
+        shard = self._get_shard(self._algorithm._pre_process(word))
+        return self._request([(shard, ("has", word))])[0]
+
+    def get_suggestions(
+        self,
+        query_word: str,
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Get the suggestions of the query word from all the shards
+
+        Args:
+            query_word (str): The given query word for suggesting indexed words
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the query word. Defaults to None, the default of the algorithm
+            limit (Optional[int], optional): The maximum number of suggestions to return, the closest first. Defaults to None, which returns all the suggestions
+
+        Returns:
+            List[dict]: The word suggestions with their corresponding distances
+        """
+
+        return self.get_suggestions_many([query_word], max_distance, limit)[0]
+
+    def get_suggestions_many(
+        self,
+        query_words: List[str],
+        max_distance: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[List[dict]]:
+        """Get the suggestions of many query words in a single request per shard, which
+            saves the round trips of `get_suggestions(...)`
+
+        Args:
+            query_words (List[str]): The query words
+            max_distance (Optional[float], optional): The maximum distance between the words indexed and the query words. Defaults to None, the default of the algorithm
+            limit (Optional[int], optional): The maximum number of suggestions per query word, the closest first. Defaults to None, which returns all the suggestions
+
+        Returns:
+            List[List[dict]]: The suggestions of every query word
+        """
+
+        if max_distance is None:
+            max_distance = self._algorithm._get_default_max_distance()
+
+        # Every shard returns its closest suggestions, among which are the closest ones
+        # of all the shards
+        shard_results = self._request(
+            [
+                (shard, ("search", query_words, max_distance, limit))
+                for shard in range(self.shards)
+                if self._filled[shard]
+            ]
+        )
+
+        results = list()
+        for i in range(len(query_words)):
+            candidates = heapq.merge(
+                *[shard_result[i] for shard_result in shard_results],
+                key=lambda candidate: (candidate[0], -candidate[1]),
+            )
+            results.append(
+                [
+                    {"word": word, "distance": distance}
+                    for distance, _, word in islice(candidates, limit)
+                ]
+            )
+        return results
+
+    def shard_sizes(self) -> List[int]:
+        """Get the number of words indexed by every shard, to check the partition
+
+        Returns:
+            List[int]: The number of words of every shard
+        """
+
+        return self._request([(shard, ("size",)) for shard in range(self.shards)])
+
+    def close(self) -> None:
+        """Stop the processes of the shards"""
+
+        connections, self._connections = self._connections, list()
+        for connection in connections:
+            try:
+                connection.send(("close",))
+                connection.recv()
+            except (EOFError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = list()
@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, List, Optional
+
+# The counters of a query which are added up over the queries
+_COUNTERS = ("nodes", "cells", "pruned", "candidates")
+
+
+class SearchStats(object):
+    """Thread-safe statistics of the queries of an algorithm. Every query is described
+    by a dict with its `query_word`, `max_distance` and `limit`, whether it was served
+    from the query cache (`cached`), the numbers of Trie `nodes` visited, of `cells` of
+    the rows computed, of subtrees `pruned` and of `candidates` returned, and its wall
+    `time` (seconds). The Trie counters are None for the searches which do not walk
+    the Trie row by row. The hooks are called with the dict of every query, and the
+    counters are added up over the queries
+    """
+
+    def __init__(self, hooks: Optional[List[Callable[[dict], None]]] = None) -> None:
+        """The constructor for the class
+
+        Args:
+            hooks (Optional[List[Callable[[dict], None]]], optional): The functions called with the statistics of every query, in the thread of the query. Defaults to None
+        """
+
+        self.hooks = list(hooks or [])
+        self.queries = 0
+        self.cached = 0
+        self.nodes = 0
+        self.cells = 0
+        self.pruned = 0
+        self.candidates = 0
+        self.time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, query_stats: dict) -> None:
+        """Add up the statistics of a query and pass them to the hooks
+
+        Args:
+            query_stats (dict): The statistics of the query
+        """
+
+        with self._lock:
+            self.queries += 1
+            self.cached += query_stats["cached"]
+            for name in _COUNTERS:
+                if query_stats[name] is not None:
+                    setattr(self, name, getattr(self, name) + query_stats[name])
+            self.time += query_stats["time"]
+            if query_stats["time"] > self.max_time:
+                self.max_time = query_stats["time"]
+
+        for hook in self.hooks:
+            hook(query_stats)
+
+    def info(self) -> dict:
+        """Get the counters added up over the queries
+
+        Returns:
+            dict: The numbers of queries, of queries served from the cache, of Trie nodes visited, of cells computed, of subtrees pruned and of candidates, the total, mean and maximum wall time of the queries (seconds)
+        """
+
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "cached": self.cached,
+                "nodes": self.nodes,
+                "cells": self.cells,
+                "pruned": self.pruned,
+                "candidates": self.candidates,
+                "time": self.time,
+                "mean_time": self.time / self.queries if self.queries else 0.0,
+                "max_time": self.max_time,
+            }
@@ -1,5 +1,16 @@
+import bz2
+import gzip
+import lzma
+import re
 from operator import itemgetter
-from typing import List
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+# Words are runs of (Unicode) letters, possibly joined by apostrophes like "don't"
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+# The letters and apostrophes which may be part of a word, matched at the end of a
+# chunk (reversed) as the word may go on in the next chunk
+_TOKEN_CHARACTERS = re.compile(r"(?:[^\W\d_]|['\u2019])*")
 
 
 def sort_list(data: List[dict], sort_key: str, descending: bool = False) -> List[dict]:
@@ -20,3 +31,158 @@ def sort_list(data: List[dict], sort_key: str, descending: bool = False) -> List
     """
 
     return sorted(data, key=itemgetter(sort_key), reverse=descending)
+
+
+def rank_candidates(
+    candidates: List[Tuple[float, float, str]],
+) -> List[Tuple[float, float, str]]:
+    """Utility function to rank the candidate words by their distance, and the ones
+        at the same distance by descending frequency, keeping their order otherwise
+
+    Args:
+        candidates (List[Tuple[float, float, str]]): The distance, frequency and word of every candidate
+
+    Returns:
+        List[Tuple[float, float, str]]: The ranked candidates
+    """
+
+    return sorted(candidates, key=lambda candidate: (candidate[0], -candidate[1]))
+
+
+def rank_suggestions(candidates: List[Tuple[float, float, str]]) -> List[dict]:
+    """Utility function to rank the candidate words, see `rank_candidates(...)`
+
+    Args:
+        candidates (List[Tuple[float, float, str]]): The distance, frequency and word of every candidate
+
+    Returns:
+        List[dict]: The word suggestions with their corresponding distances
+    """
+
+    return [
+        {"word": word, "distance": distance}
+        for distance, _, word in rank_candidates(candidates)
+    ]
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """Utility function to get the percentile of values, using the nearest-rank method
+
+    Args:
+        values (List[float]): The sorted values
+        percentile (float): The percentile, between 0 and 100
+
+    Returns:
+        float: The value at the percentile, 0 if there are no values
+    """
+
+    if not values:
+        return 0.0
+    rank = max(1, int(round(percentile / 100 * len(values) + 0.5)))
+    return values[min(rank, len(values)) - 1]
+
+
+def get_length_bounds(
+    dictionary, query_length: int, band: Optional[float]
+) -> Optional[Tuple[float, float]]:
+    """Utility function to get the shortest and the longest words which can be within
+        the maximum distance of a query word, when some indexed words are not
+
+    Args:
+        dictionary (Dictionary): The root of the Trie dictionary, whose `min_length` and `max_length` are the bounds of the lengths of the indexed words
+        query_length (int): The length of the pre-processed query word
+        band (Optional[float]): The largest difference between the lengths of the query word and of a word within the maximum distance, None for no bound
+
+    Returns:
+        Optional[Tuple[float, float]]: The shortest and the longest lengths, or None if all the indexed words may be within the maximum distance
+    """
+
+    if band is None:
+        return None
+
+    shortest = query_length - band
+    longest = query_length + band
+    if dictionary.min_length >= shortest and dictionary.max_length <= longest:
+        return None
+    return shortest, longest
+
+
+def open_text(path: str) -> IO[str]:
+    """Utility function to open a text file for reading, transparently decompressing
+        gzip, bz2 and xz files (detected from their first bytes)
+
+    Args:
+        path (str): The path to the file
+
+    Returns:
+        IO[str]: The file object, to be read line by line
+    """
+
+    with open(path, "rb") as fd:
+        magic = fd.read(6)
+
+    if magic.startswith(b"\x1f\x8b"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if magic.startswith(b"BZh"):
+        return bz2.open(path, "rt", encoding="utf-8")
+    if magic.startswith(b"\xfd7zXZ\x00"):
+        return lzma.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def read_words(path: str) -> Iterator[Tuple[str, Optional[float]]]:
+    """Utility function to stream the words of a (possibly compressed) text file.
+        Every line either consists of whitespace separated words, or of a word and
+        its frequency separated by a tab
+
+    Args:
+        path (str): The path to the file
+
+    Raises:
+        ValueError: If the frequency on a line is not a number
+
+    Yields:
+        Tuple[str, Optional[float]]: The word and its frequency, None when the line has no frequency
+    """
+
+    with open_text(path) as fd:
+        for line_number, line in enumerate(fd, 1):
+            if "\t" in line:
+                word, frequency = line.split("\t", 1)
+                word = word.strip()
+                if not word:
+                    continue
+                try:
+                    yield word, float(frequency)
+                except ValueError:
+                    raise ValueError(
+                        "Invalid frequency on line {} of '{}'".format(line_number, path)
+                    )
+            else:
+                for word in line.split():
+                    yield word, None
+
+
+def iter_tokens(chunks: Iterable[str]) -> Iterator[Tuple[str, int]]:
+    """Utility function to lazily split a stream of text into words. The words cut by
+        the end of a chunk are completed with the next chunks
+
+    Args:
+        chunks (Iterable[str]): The text, in chunks of any size (for example the lines of a file)
+
+    Yields:
+        Tuple[str, int]: The word and the character offset of its start in the text
+    """
+
+    offset = 0
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        end = len(buffer) - _TOKEN_CHARACTERS.match(buffer[::-1]).end()
+        for match in _TOKEN_PATTERN.finditer(buffer, 0, end):
+            yield match.group(), offset + match.start()
+        offset += end
+        buffer = buffer[end:]
+
+    for match in _TOKEN_PATTERN.finditer(buffer):
+        yield match.group(), offset + match.start()
@@ -0,0 +1,39 @@
+import pytest
+
+from spellwise import Levenshtein, SymSpell
+
+
+@pytest.fixture
+def broken_path(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("spelling\t3\nspeling\t1\nmisspelling\tmany\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("algorithm_class", [Levenshtein, SymSpell])
+def test_add_from_path_keeps_the_previous_version_on_error(
+    broken_path, algorithm_class
+):
+    algorithm = algorithm_class()
+    algorithm.add_words(["spell"])
+    version = algorithm.version
+
+    with pytest.raises(ValueError):
+        algorithm.add_from_path(broken_path, batch_size=1)
+
+    assert algorithm.version == version
+    assert not algorithm.has_word("spelling")
+    assert not algorithm.is_known("spelling")
+    assert algorithm.get_suggestions("spelin", 2) == [{"word": "spell", "distance": 2}]
+
+
+def test_add_from_path_rolls_back_the_deletion_index_on_error(broken_path):
+    algorithm = SymSpell()
+    algorithm.add_words(["spell"])
+    deletes = {key: list(words) for key, words in algorithm._deletes.items()}
+
+    with pytest.raises(ValueError):
+        algorithm.add_from_path(broken_path, batch_size=1)
+
+    assert algorithm._deletes == deletes
+    assert algorithm._indexed_words == {"spell"}
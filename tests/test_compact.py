@@ -0,0 +1,30 @@
+import sys
+import threading
+
+from spellwise.dictionary import CompactDictionary
+
+
+def test_compact_dictionary_keeps_the_words_added_during_a_rebuild():
+    dictionary = CompactDictionary()
+    words = ["word{}".format(i) for i in range(2000)]
+    done = threading.Event()
+
+    def search():
+        while not done.is_set():
+            dictionary.children
+
+    # Switch threads as often as possible, for the words to be added while the
+    # searches rebuild the arrays
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    searcher = threading.Thread(target=search)
+    searcher.start()
+    try:
+        for word in words:
+            dictionary.add_words([(word, word, None)])
+    finally:
+        done.set()
+        searcher.join()
+        sys.setswitchinterval(interval)
+
+    assert sorted(word for _, word, _ in dictionary.iter_words()) == sorted(words)
@@ -0,0 +1,24 @@
+import pytest
+
+from spellwise import Levenshtein
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_load_rejects_a_truncated_index(tmp_path, mmap):
+    algorithm = Levenshtein(compact=True)
+    algorithm.add_words(["spell", "spelling", "spelt"])
+    path = str(tmp_path / "words.index")
+    algorithm.save(path)
+    with open(path, "rb") as fd:
+        data = fd.read()
+
+    truncated_path = str(tmp_path / "truncated.index")
+    for length in range(len(data)):
+        with open(truncated_path, "wb") as fd:
+            fd.write(data[:length])
+        with pytest.raises(ValueError):
+            Levenshtein(compact=True).load(truncated_path, mmap=mmap)
+
+    loaded = Levenshtein(compact=True)
+    loaded.load(path, mmap=mmap)
+    assert loaded.get_suggestions("spel", 1) == algorithm.get_suggestions("spel", 1)
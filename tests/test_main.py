@@ -0,0 +1,31 @@
+import json
+
+from spellwise.__main__ import main
+
+
+def test_main_writes_an_error_record_for_a_word_which_cannot_be_searched(tmp_path):
+    lexicon = tmp_path / "words.txt"
+    lexicon.write_text("hello\nworld\n")
+    inputs = tmp_path / "queries.txt"
+    inputs.write_text("hallo\n123\nwurld\n")
+    output = tmp_path / "suggestions.jsonl"
+
+    main(
+        [
+            "--algorithm",
+            "Soundex",
+            "--lexicon",
+            str(lexicon),
+            "--output",
+            str(output),
+            "--quiet",
+            str(inputs),
+        ]
+    )
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["word"] for record in records] == ["hallo", "123", "wurld"]
+    assert records[0]["suggestions"] == [{"word": "hello", "distance": 0}]
+    assert "suggestions" not in records[1]
+    assert records[1]["error"].startswith("IndexError")
+    assert records[2]["suggestions"] == [{"word": "world", "distance": 0}]
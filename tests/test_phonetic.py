@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from spellwise import CaverphoneOne, CaverphoneTwo, Soundex
+from spellwise.algorithms.phonetic import Phonetic
+
+LEXICON = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "data", "american-english"
+)
+
+# The codes given by the encoders before they were compiled into tables: for random
+# strings, strings made of the letters the Caverphone rules rewrite, edge cases and a
+# sample of the bundled word list, and a digest of the codes of the whole list
+CODES = os.path.join(os.path.dirname(__file__), "data", "phonetic_codes.json")
+
+
+@pytest.fixture(scope="module")
+def expected():
+    with open(CODES, encoding="utf-8") as fd:
+        return json.load(fd)
+
+
+@pytest.fixture(scope="module")
+def words():
+    with open(LEXICON) as fd:
+        return fd.read().split()
+
+
+ALGORITHMS = [Soundex, CaverphoneOne, CaverphoneTwo]
+
+
+@pytest.mark.parametrize("algorithm_class", ALGORITHMS)
+def test_encode_gives_the_frozen_codes(expected, algorithm_class):
+    algorithm = algorithm_class()
+
+    for word, code in zip(
+        expected["inputs"], expected["codes"][algorithm_class.__name__]
+    ):
+        if isinstance(code, dict):
+            with pytest.raises(Exception) as error:
+                algorithm.encode(word)
+            assert type(error.value).__name__ == code["error"], word
+        else:
+            assert algorithm.encode(word) == code, word
+
+
+@pytest.mark.parametrize("algorithm_class", ALGORITHMS)
+def test_encode_many_gives_the_frozen_codes_of_the_word_list(
+    expected, words, algorithm_class
+):
+    algorithm = algorithm_class()
+    algorithm.enable_memo()
+    codes = "\n".join(algorithm.encode_many(words))
+
+    assert (
+        hashlib.sha256(codes.encode("utf-8")).hexdigest()
+        == expected["lexicon_sha256"][algorithm_class.__name__]
+    )
+    assert algorithm.encode_many(words[:1000]) == [
+        algorithm.encode(word) for word in words[:1000]
+    ]
+
+
+def test_phonetic_needs_an_encoder():
+    with pytest.raises(TypeError):
+        Phonetic()
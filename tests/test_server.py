@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from spellwise import Levenshtein
+from spellwise.serve import SpellServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    algorithm = Levenshtein()
+    algorithm.add_words(["spell", "spelt", "spill"])
+    return SpellServer(algorithm)
+
+
+def route(server, method, target, body=b""):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(server._route(method, target, body))
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "limit=inf",
+        "limit=nan",
+        "limit=-1",
+        "limit=1.5",
+        "limit=two",
+        "max_distance=inf",
+        "max_distance=-inf",
+        "max_distance=nan",
+        "max_distance=-0.5",
+    ],
+)
+def test_get_rejects_invalid_numbers(server, query):
+    status, payload = route(server, "GET", "/suggest?word=spel&" + query)
+
+    assert status == 400
+    assert "error" in payload
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        {"limit": -1},
+        {"limit": 1.5},
+        {"limit": True},
+        {"limit": "inf"},
+        {"max_distance": -1},
+        {"max_distance": "nan"},
+        {"max_distance": False},
+    ],
+)
+def test_post_rejects_invalid_numbers(server, parameters):
+    body = json.dumps(dict(parameters, words=["spel"])).encode("utf-8")
+    status, payload = route(server, "POST", "/suggest", body)
+
+    assert status == 400
+    assert "error" in payload
+
+
+def test_process_workers_answer_the_queries(server):
+    process_server = SpellServer(server.algorithm, port=0, workers=2, processes=True)
+
+    async def query():
+        await process_server.start()
+        try:
+            return await process_server._route(
+                "GET", "/suggest?word=spel&max_distance=1&limit=2", b""
+            )
+        finally:
+            await process_server.stop()
+
+    loop = asyncio.new_event_loop()
+    try:
+        status, payload = loop.run_until_complete(query())
+    finally:
+        loop.close()
+
+    assert status == 200
+    assert payload["suggestions"] == server.algorithm.get_suggestions("spel", 1, 2)
@@ -0,0 +1,59 @@
+import os
+import random
+
+import pytest
+
+from spellwise import Editex, Levenshtein, Typox
+
+LEXICON = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "data", "american-english"
+)
+
+
+@pytest.fixture(scope="module")
+def words():
+    with open(LEXICON) as fd:
+        return random.Random(0).sample(fd.read().split(), 3000)
+
+
+def iter_typing(words, seed):
+    """Query words as typed in a search box: letters typed, erased and replaced"""
+
+    generator = random.Random(seed)
+    query_word = ""
+    for _ in range(200):
+        draw = generator.random()
+        if query_word and draw < 0.3:
+            query_word = query_word[: -generator.randint(1, len(query_word))]
+        elif draw < 0.4:
+            query_word = generator.choice(words)[: generator.randint(0, 8)]
+        else:
+            query_word += generator.choice("abdeilnorstu'")
+        yield query_word
+
+
+@pytest.mark.parametrize("algorithm_class", [Levenshtein, Editex, Typox])
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("max_distance, limit", [(1, None), (2, 5), (1.5, None)])
+def test_session_matches_get_suggestions(
+    words, algorithm_class, compact, max_distance, limit
+):
+    algorithm = algorithm_class(compact=compact)
+    algorithm.add_words(words)
+    session = algorithm.begin_query(max_distance, limit)
+
+    for query_word in iter_typing(words, seed=len(words)):
+        assert session.update(query_word) == algorithm.get_suggestions(
+            query_word, max_distance, limit
+        )
+
+
+def test_session_starts_over_when_words_change(words):
+    algorithm = Levenshtein()
+    algorithm.add_words(words)
+    session = algorithm.begin_query(1)
+    session.update("spellwis")
+
+    algorithm.add_words(["spellwise"])
+
+    assert session.update("spellwise")[0] == {"word": "spellwise", "distance": 0}
@@ -0,0 +1,25 @@
+import pytest
+
+from spellwise import Editex, Levenshtein, Soundex, SymSpell
+from spellwise.serve import ShardedIndex
+
+WORDS = ["hello", "help", "helm", "hell", "halo", "yellow", "fellow", "he", "hero"]
+FREQUENCIES = [5, 3, 1, 4, 2, 6, 8, 7, 9]
+
+
+@pytest.mark.parametrize("algorithm_class", [Levenshtein, Editex, Soundex, SymSpell])
+@pytest.mark.parametrize("limit", [None, 1, 3])
+def test_sharded_index_ranks_like_a_single_index(algorithm_class, limit):
+    algorithm = algorithm_class()
+    algorithm.add_words(WORDS, FREQUENCIES)
+    index = ShardedIndex(algorithm_class, shards=3)
+    try:
+        index.add_words(WORDS, FREQUENCIES)
+        query_words = ["helo", "yelow", "hero"]
+        for max_distance in [0, 1, 2]:
+            assert index.get_suggestions_many(query_words, max_distance, limit) == [
+                algorithm.get_suggestions(query_word, max_distance, limit)
+                for query_word in query_words
+            ]
+    finally:
+        index.close()
@@ -0,0 +1,18 @@
+import pytest
+
+from spellwise import Levenshtein, SymSpell
+
+WORDS = ["hello", "help", "helm", "hell", "halo", "yellow", "fellow", "he", "hero"]
+
+
+@pytest.mark.parametrize("max_distance", [0.5, 1.5, 2.5])
+def test_symspell_accepts_a_fractional_distance(max_distance):
+    symspell = SymSpell()
+    symspell.add_words(WORDS)
+    levenshtein = Levenshtein()
+    levenshtein.add_words(WORDS)
+
+    for query_word in ["helo", "hllo", "yelow", "h"]:
+        assert symspell.get_suggestions(
+            query_word, max_distance
+        ) == levenshtein.get_suggestions(query_word, max_distance)
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from spellwise import Levenshtein
+from spellwise.utils import iter_tokens
+
+LEXICON = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "data", "american-english"
+)
+
+TEXT = "A naïve café serves éclairs, l’été don't Straße."
+WORDS = ["A", "naïve", "café", "serves", "éclairs", "l’été", "don't", "Straße"]
+
+
+def test_iter_tokens_keeps_non_ascii_words_whole():
+    tokens = list(iter_tokens([TEXT]))
+
+    assert [word for word, _ in tokens] == WORDS
+    for word, start in tokens:
+        assert TEXT[start : start + len(word)] == word
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8])
+def test_iter_tokens_completes_words_cut_by_chunks(size):
+    chunks = [TEXT[i : i + size] for i in range(0, len(TEXT), size)]
+
+    assert list(iter_tokens(chunks)) == list(iter_tokens([TEXT]))
+
+
+def test_iter_tokens_splits_on_digits_and_underscores():
+    assert [word for word, _ in iter_tokens(["crème_brûlée 42café"])] == [
+        "crème",
+        "brûlée",
+        "café",
+    ]
+
+
+@pytest.fixture(scope="module")
+def algorithm():
+    algorithm = Levenshtein()
+    algorithm.add_from_path(LEXICON)
+    return algorithm
+
+
+def test_check_text_checks_accented_words_whole(algorithm):
+    # "café" and "éclairs" are indexed, "naïve" is not (only "naive" is)
+    misspellings = list(
+        algorithm.check_text("A naïve café serves éclairs.", max_distance=1, limit=1)
+    )
+
+    assert misspellings == [
+        {
+            "word": "naïve",
+            "start": 2,
+            "end": 7,
+            "suggestions": [{"word": "naive", "distance": 1}],
+        }
+    ]
+
+
+def test_check_text_reports_accented_misspellings_at_their_offsets(algorithm):
+    text = "The cafés sell éclaiers."
+    misspellings = list(algorithm.check_text(text, max_distance=1, limit=1))
+
+    assert [(item["word"], item["start"], item["end"]) for item in misspellings] == [
+        ("éclaiers", 15, 23)
+    ]
+    assert misspellings[0]["suggestions"] == [{"word": "éclairs", "distance": 1}]